@@ -248,6 +248,45 @@ ENABLE_AUTH = True
 ENABLE_STORAGE = True
 MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio")       # "stdio" or "http"
 MCP_HTTP_PORT = int(os.getenv("MCP_HTTP_PORT", "8000"))
+# Max JSON-RPC batch entries executed at once, and max entries per batch
+MCP_BATCH_CONCURRENCY = int(os.getenv("MCP_BATCH_CONCURRENCY", "10"))
+MCP_MAX_BATCH_SIZE = int(os.getenv("MCP_MAX_BATCH_SIZE", "100"))
+# Default number of documents per query_collection page
+MCP_QUERY_PAGE_SIZE = int(os.getenv("MCP_QUERY_PAGE_SIZE", "100"))
+# Upper bound on requested page sizes; larger requests are cut to this
+MCP_QUERY_MAX_PAGE_SIZE = int(os.getenv("MCP_QUERY_MAX_PAGE_SIZE", "1000"))
+# Cache-Control max-age (seconds) for server info and tools/list responses
+MCP_TOOLS_CACHE_MAX_AGE = int(os.getenv("MCP_TOOLS_CACHE_MAX_AGE", "300"))
+# Default tools/call result format: "text", "both" or "structured"
+MCP_RESULT_FORMAT = os.getenv("MCP_RESULT_FORMAT", "text")
+# get_document read-through cache. TTL is in seconds; 0 disables caching
+MCP_DOCUMENT_CACHE = {
+    "TTL": int(os.getenv("MCP_DOCUMENT_CACHE_TTL", "0")),
+    "MAX_ENTRIES": int(os.getenv("MCP_DOCUMENT_CACHE_MAX_ENTRIES", "1000")),
+    # Per-collection TTL overrides, e.g. {"config": 600, "orders": 0}
+    "COLLECTION_TTLS": {},
+    # Django cache alias (locmem, redis, memcached) to share entries between
+    # processes; None keeps them in process memory
+    "BACKEND": os.getenv("MCP_DOCUMENT_CACHE_BACKEND") or None,
+}
+# Worker threads per Firebase service for blocking SDK calls. Each service
+# has its own pool, so slow Storage transfers can't delay Auth or Firestore
+MCP_EXECUTOR_WORKERS = {
+    "auth": int(os.getenv("MCP_AUTH_WORKERS", "8")),
+    "firestore": int(os.getenv("MCP_FIRESTORE_WORKERS", "8")),
+    "storage": int(os.getenv("MCP_STORAGE_WORKERS", "4")),
+}
+# Bytes per request when streaming Storage files to or from disk (a multiple
+# of 256 KiB); bounds the memory a transfer uses
+MCP_STORAGE_CHUNK_SIZE = int(os.getenv("MCP_STORAGE_CHUNK_SIZE", str(8 * 1024 * 1024)))
+# Directory that local_path arguments (upload_file, download_file,
+# export_tree) are confined to; relative paths are taken from it
+MCP_LOCAL_FILES_ROOT = os.getenv("MCP_LOCAL_FILES_ROOT", str(BASE_DIR / "mcp_files"))
+# Default number of files per list_files page
+MCP_STORAGE_LIST_PAGE_SIZE = int(os.getenv("MCP_STORAGE_LIST_PAGE_SIZE", "1000"))
+# Hot collections kept in memory by on_snapshot listeners, mapped to the max
+# documents to mirror for each, e.g. {"config": 1000}
+MCP_MIRROR_COLLECTIONS = {}
 
 # CORS settings for MCP
 CORS_ALLOW_ALL_ORIGINS = True
@@ -0,0 +1,163 @@
+"""
+Read-through cache for Firestore documents.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Key prefix for entries stored in a Django cache backend
+KEY_PREFIX = 'mcp:doc:'
+
+
+class DocumentCache:
+    """
+    Cache documents read by get_document, keyed by document path.
+
+    Entries are kept in an in-process LRU, or in a Django cache backend when
+    one is configured (the backend then handles eviction). A TTL of 0
+    disables caching, globally or for a single collection.
+    """
+
+    def __init__(
+        self,
+        ttl: int = 0,
+        max_entries: int = 1000,
+        collection_ttls: Optional[Dict[str, int]] = None,
+        backend: Optional[str] = None
+    ):
+        """
+        Args:
+            ttl: Default seconds a document stays cached
+            max_entries: LRU size limit for the in-process cache
+            collection_ttls: Per-collection TTL overrides
+            backend: Django cache alias to store documents in instead
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.collection_ttls = collection_ttls or {}
+        self._backend = caches[backend] if backend else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation, so reads that started before a write
+        # don't put stale data back into the cache
+        self._generation = 0
+
+    def ttl_for(self, collection: str) -> int:
+        """Return the TTL in seconds for documents of a collection."""
+        return self.collection_ttls.get(collection, self.ttl)
+
+    def generation(self) -> int:
+        """Return a token to pass to set() for a read that is starting now."""
+        return self._generation
+
+    def get(self, path: str) -> Optional[dict]:
+        """Return a copy of the cached document at path, or None on a miss."""
+        if self._backend is not None:
+            value = self._backend.get(KEY_PREFIX + path)
+        else:
+            value = self._get_local(path)
+        # Copy so callers can't modify the cached document
+        return dict(value) if value is not None else None
+
+    async def aget(self, path: str) -> Optional[dict]:
+        """get() for async callers; backend I/O doesn't block the event loop."""
+        if self._backend is not None:
+            value = await self._backend.aget(KEY_PREFIX + path)
+        else:
+            value = self._get_local(path)
+        return dict(value) if value is not None else None
+
+    def _get_local(self, path: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[path]
+                return None
+            self._entries.move_to_end(path)
+            return value
+
+    def set(self, path: str, value: dict, ttl: int, generation: int):
+        """
+        Cache a document read.
+
+        The entry is dropped if anything was invalidated since generation
+        was taken, since the read may predate that write.
+        """
+        if self._backend is None:
+            self._set_local(path, value, ttl, generation)
+            return
+        if generation != self._generation:
+            return
+        self._backend.set(KEY_PREFIX + path, value, ttl)
+        # Backend I/O runs outside the lock, so an invalidation may have
+        # slipped in while the entry was being stored
+        if generation != self._generation:
+            self._backend.delete(KEY_PREFIX + path)
+
+    async def aset(self, path: str, value: dict, ttl: int, generation: int):
+        """set() for async callers; backend I/O doesn't block the event loop."""
+        if self._backend is None:
+            self._set_local(path, value, ttl, generation)
+            return
+        if generation != self._generation:
+            return
+        await self._backend.aset(KEY_PREFIX + path, value, ttl)
+        if generation != self._generation:
+            await self._backend.adelete(KEY_PREFIX + path)
+
+    def _set_local(self, path: str, value: dict, ttl: int, generation: int):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[path] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _invalidate_local(self, paths):
+        with self._lock:
+            self._generation += 1
+            for path in paths:
+                self._entries.pop(path, None)
+
+    def invalidate(self, *paths: str):
+        """Drop the cached documents at the given paths."""
+        self._invalidate_local(paths)
+        if self._backend is not None:
+            self._backend.delete_many([KEY_PREFIX + path for path in paths])
+
+    async def ainvalidate(self, *paths: str):
+        """invalidate() for async callers; backend I/O doesn't block the event loop."""
+        self._invalidate_local(paths)
+        if self._backend is not None:
+            await self._backend.adelete_many([KEY_PREFIX + path for path in paths])
+
+    def clear(self):
+        """Drop every cached document held in process."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+_document_cache = None
+
+
+def get_document_cache() -> DocumentCache:
+    """Get the document cache configured by settings.MCP_DOCUMENT_CACHE."""
+    global _document_cache
+    if _document_cache is None:
+        config = settings.MCP_DOCUMENT_CACHE
+        _document_cache = DocumentCache(
+            ttl=config.get('TTL', 0),
+            max_entries=config.get('MAX_ENTRIES', 1000),
+            collection_ttls=config.get('COLLECTION_TTLS'),
+            backend=config.get('BACKEND')
+        )
+    return _document_cache
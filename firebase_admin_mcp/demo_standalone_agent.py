@@ -64,6 +64,8 @@ def demo_standalone_firebase_agent():
     print("\n3. Import and use programmatically:")
     print("   from firebase_admin_mcp.standalone_firebase_agent import create_standalone_firebase_agent")
     print("   agent = create_standalone_firebase_agent()")
+    print("   response = agent.invoke({\"messages\": [HumanMessage(content=\"List Firebase collections\")]})")
+    print("   (or asyncio.run(agent.ainvoke(...)) to run tool calls concurrently)")
 
     print("\n4. Run with custom MCP server URL:")
     print("   python manage.py run_standalone_agent --server-url http://localhost:8002/mcp/")
@@ -0,0 +1,73 @@
+"""
+JSON serialization for MCP responses, built on orjson.
+"""
+import base64
+from datetime import date, datetime, time
+from typing import Any, Iterator
+
+import orjson
+from google.cloud.firestore import GeoPoint
+from google.cloud.firestore_v1.base_document import BaseDocumentReference
+
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Convert Firebase and other non-JSON types that orjson can't handle."""
+    # DatetimeWithNanoseconds and other datetime subclasses
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, GeoPoint):
+        return {'latitude': obj.latitude, 'longitude': obj.longitude}
+    if isinstance(obj, BaseDocumentReference):
+        return obj.path
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(obj)).decode('ascii')
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # Other timestamp-like objects
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    # Handle other non-serializable objects
+    if hasattr(obj, '__dict__'):
+        return str(obj)
+    raise TypeError(f'Type is not JSON serializable: {type(obj).__name__}')
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes."""
+    return orjson.dumps(obj, default=_default, option=DUMPS_OPTIONS)
+
+
+def iter_dumps(obj: Any, depth: int = 2) -> Iterator[bytes]:
+    """
+    Serialize an object to JSON as a sequence of byte chunks.
+
+    The top ``depth`` levels of dicts and lists are streamed element by
+    element; anything deeper is serialized in one piece. Joining the chunks
+    gives exactly ``dumps(obj)``.
+
+    Args:
+        obj: The object to serialize
+        depth: How many container levels to stream
+
+    Yields:
+        bytes: Consecutive pieces of the JSON document
+    """
+    if depth > 0 and isinstance(obj, dict):
+        yield b'{'
+        for index, (key, value) in enumerate(obj.items()):
+            if not isinstance(key, str):
+                key = str(key)
+            yield (b',' if index else b'') + orjson.dumps(key) + b':'
+            yield from iter_dumps(value, depth - 1)
+        yield b'}'
+    elif depth > 0 and isinstance(obj, (list, tuple)):
+        yield b'['
+        for index, value in enumerate(obj):
+            if index:
+                yield b','
+            yield from iter_dumps(value, depth - 1)
+        yield b']'
+    else:
+        yield dumps(obj)
@@ -1,10 +1,18 @@
 """
 Firebase Admin SDK initialization for MCP server.
 """
+import asyncio
+import contextvars
 import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
 import firebase_admin
 from firebase_admin import credentials, firestore, auth, storage
 from django.conf import settings
+from google.cloud.firestore import AsyncClient
 
 # Global variables to hold initialized services
 _db = None
@@ -12,6 +20,14 @@ _auth_client = None
 _bucket = None
 _initialized = False
 
+# Async Firestore clients, one per event loop, since their gRPC channels are
+# bound to the loop that created them
+_async_dbs = weakref.WeakKeyDictionary()
+
+# Worker pools for blocking SDK calls, one per service (see run_in_executor)
+_executors = {}
+_executors_lock = threading.Lock()
+
 
 def _initialize_firebase():
     """Initialize Firebase Admin SDK once."""
@@ -55,6 +71,28 @@ def get_db():
     return _db
 
 
+def get_async_db():
+    """
+    Get the async Firestore client for the running event loop.
+
+    Tools await it directly instead of holding a thread per call, so
+    concurrent reads are bounded by the gRPC channel rather than a thread pool.
+    """
+    if not _initialized:
+        _initialize_firebase()
+    if _db is None:
+        return None
+
+    loop = asyncio.get_running_loop()
+    db = _async_dbs.get(loop)
+    if db is None:
+        app = firebase_admin.get_app()
+        db = AsyncClient(
+            credentials=app.credential.get_credential(), project=app.project_id)
+        _async_dbs[loop] = db
+    return db
+
+
 def get_auth():
     """Get Firebase Auth client."""
     if not _initialized:
@@ -67,3 +105,102 @@ def get_bucket():
     if not _initialized:
         _initialize_firebase()
     return _bucket
+
+
+class ServiceExecutor:
+    """
+    Thread pool for the blocking SDK calls of one Firebase service.
+
+    Each service gets its own pool so slow calls of one (e.g. Storage
+    transfers) can't hold up the others. Queue depth and the time calls
+    wait for a worker are tracked for stats().
+    """
+
+    def __init__(self, service: str, max_workers: int):
+        self.service = service
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f'firebase-{service}')
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def run(self, func, *args):
+        """Run func(*args) in the pool, in a copy of the caller's context."""
+        context = contextvars.copy_context()
+        submitted_at = time.monotonic()
+
+        def _call():
+            waited = time.monotonic() - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+            try:
+                return context.run(func, *args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        def _done(future):
+            # Calls cancelled while still queued never reach _call
+            if future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        with self._lock:
+            self._queued += 1
+        future = self._pool.submit(_call)
+        future.add_done_callback(_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        """Return pool size, queue depth, and wait times in milliseconds."""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'queued': self._queued,
+                'running': self._running,
+                'completed': self._completed,
+                'avg_wait_ms': round(self._total_wait / self._completed * 1000, 3) if self._completed else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 3)
+            }
+
+
+def get_executor(service: str) -> ServiceExecutor:
+    """Get the worker pool for a service, sized by settings.MCP_EXECUTOR_WORKERS."""
+    executor = _executors.get(service)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(service)
+            if executor is None:
+                if service not in settings.MCP_EXECUTOR_WORKERS:
+                    raise ValueError(f"Unknown Firebase service: {service!r}")
+                executor = ServiceExecutor(service, settings.MCP_EXECUTOR_WORKERS[service])
+                _executors[service] = executor
+    return executor
+
+
+async def run_in_executor(service: str, func, *args):
+    """
+    Run a blocking SDK call in the worker pool of a service.
+
+    Args:
+        service: "auth", "firestore" or "storage"
+        func: Callable to run
+        *args: Arguments for func
+
+    Returns:
+        The result of func(*args)
+    """
+    return await get_executor(service).run(func, *args)
+
+
+def executor_stats() -> Dict[str, dict]:
+    """Return stats() for every service pool started so far."""
+    return {service: executor.stats() for service, executor in _executors.items()}
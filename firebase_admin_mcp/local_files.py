@@ -0,0 +1,30 @@
+"""
+Server-side files named by MCP tool arguments.
+"""
+import os
+from django.conf import settings
+
+
+def resolve_local_path(path: str) -> str:
+    """
+    Resolve a tool's local_path inside settings.MCP_LOCAL_FILES_ROOT.
+
+    Relative paths are taken from the root. ".." and symlinks are resolved
+    before the check, so a path can't name a file outside the root, e.g.
+    the service account key.
+
+    Args:
+        path: local_path argument of a tool call
+
+    Returns:
+        str: The resolved absolute path
+
+    Raises:
+        ValueError: If the path resolves outside the root
+    """
+    root = os.path.realpath(settings.MCP_LOCAL_FILES_ROOT)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if resolved == root or os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"local_path must be a file inside MCP_LOCAL_FILES_ROOT: {path}")
+    os.makedirs(root, exist_ok=True)
+    return resolved
@@ -24,11 +24,21 @@ class Command(BaseCommand):
 
         # Register all tools from firestore module
         mcp.tool()(firestore.get_document)
+        mcp.tool()(firestore.get_documents)
         mcp.tool()(firestore.create_document)
         mcp.tool()(firestore.update_document)
         mcp.tool()(firestore.delete_document)
+        mcp.tool()(firestore.batch_write)
+        mcp.tool()(firestore.transact)
+        mcp.tool()(firestore.delete_collection)
         mcp.tool()(firestore.list_collections)
+        mcp.tool()(firestore.list_subcollections)
+        mcp.tool()(firestore.export_tree)
         mcp.tool()(firestore.query_collection)
+        mcp.tool()(firestore.query_collection_group)
+        mcp.tool()(firestore.count_documents)
+        mcp.tool()(firestore.sum_field)
+        mcp.tool()(firestore.avg_field)
 
         # Register all tools from storage module
         mcp.tool()(storage.upload_file)
@@ -0,0 +1,275 @@
+"""
+Live in-memory mirrors of hot Firestore collections.
+
+Each collection listed in settings.MCP_MIRROR_COLLECTIONS gets an on_snapshot
+listener that keeps a local copy of its documents current, so reads of those
+collections need no RPCs. Mirrors only answer while their listener is
+connected and synced; otherwise tools fall back to reading Firestore.
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from google.cloud.firestore_v1.watch import ChangeType
+
+from .firebase_init import get_db
+
+logger = logging.getLogger(__name__)
+
+# Seconds between listener health checks
+SUPERVISOR_INTERVAL = 5
+
+# Reconnect backoff bounds in seconds
+RECONNECT_DELAY_MIN = 1
+RECONNECT_DELAY_MAX = 60
+
+# Seconds a locally written document is read from Firestore instead of the
+# mirror, unless its change arrives through the listener sooner
+PENDING_WRITE_TIMEOUT = 10
+
+
+def _field_equals(data: dict, field: str, expected) -> bool:
+    """Check a (dotted) field against a value with Firestore == semantics."""
+    value = data
+    for part in field.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return False
+        value = value[part]
+    # Firestore never treats booleans as equal to numbers
+    if isinstance(value, bool) != isinstance(expected, bool):
+        return False
+    return value == expected
+
+
+class CollectionMirror:
+    """Local copy of one collection, updated incrementally from snapshots."""
+
+    def __init__(self, collection: str, max_documents: int):
+        self.collection = collection
+        self.max_documents = max_documents
+        # Set when the collection outgrew max_documents; the mirror then
+        # stays off and reads go to Firestore
+        self.overflowed = False
+        self._documents = {}
+        self._pending_writes = {}
+        self._synced = False
+        self._watch = None
+        self._lock = threading.Lock()
+        self._reconnect_delay = RECONNECT_DELAY_MIN
+        self._retry_at = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether the listener is connected."""
+        return self._watch is not None and self._watch.is_active
+
+    @property
+    def ready(self) -> bool:
+        """Whether the mirror is connected and holds a full snapshot."""
+        return self._synced and self.active
+
+    def start(self, db):
+        """Attach a new listener; the mirror is served once it has synced."""
+        self.stop()
+        self._watch = db.collection(self.collection).on_snapshot(self._on_snapshot)
+
+    def stop(self):
+        """Detach the listener and stop serving reads."""
+        watch, self._watch = self._watch, None
+        with self._lock:
+            self._synced = False
+        if watch is not None:
+            watch.unsubscribe()
+
+    def _on_snapshot(self, docs, changes, read_time):
+        if len(docs) > self.max_documents:
+            logger.warning(
+                f"[MIRROR] {self.collection} has {len(docs)} documents, over its "
+                f"limit of {self.max_documents}; mirroring disabled")
+            self.overflowed = True
+            with self._lock:
+                self._synced = False
+                self._documents = {}
+            # Closing the watch joins the thread running this callback
+            threading.Thread(target=self.stop, daemon=True).start()
+            return
+
+        with self._lock:
+            if not self._synced:
+                # First snapshot of a new listener. Changes made while it was
+                # disconnected are not replayed, so rebuild from the full set.
+                self._documents = {doc.id: doc.to_dict() for doc in docs}
+                self._pending_writes.clear()
+                self._synced = True
+                return
+
+            for change in changes:
+                doc = change.document
+                if change.type == ChangeType.REMOVED:
+                    self._documents.pop(doc.id, None)
+                else:
+                    self._documents[doc.id] = doc.to_dict()
+                self._pending_writes.pop(doc.id, None)
+
+    def note_write(self, doc_id: str):
+        """
+        Record a write made by this process.
+
+        The listener delivers it shortly after, so until then reads of that
+        document fall back to Firestore to keep read-your-writes.
+        """
+        with self._lock:
+            self._pending_writes[doc_id] = time.monotonic() + PENDING_WRITE_TIMEOUT
+
+    def _has_pending_writes(self, doc_id: Optional[str] = None) -> bool:
+        """Check for unconfirmed local writes (to one document, or any)."""
+        now = time.monotonic()
+        for pending_id, expires_at in list(self._pending_writes.items()):
+            if expires_at <= now:
+                del self._pending_writes[pending_id]
+        if doc_id is None:
+            return bool(self._pending_writes)
+        return doc_id in self._pending_writes
+
+    def get(self, doc_id: str) -> Optional[dict]:
+        """
+        Get a document from the mirror.
+
+        Returns:
+            dict or None: Document data with '_id', {} if the document does
+                not exist, or None if the mirror can't answer
+        """
+        if not self.ready:
+            return None
+        with self._lock:
+            if self._has_pending_writes(doc_id):
+                return None
+            data = self._documents.get(doc_id)
+        if data is None:
+            return {}
+        data = dict(data)
+        data['_id'] = doc_id
+        return data
+
+    def query(
+        self,
+        filters: Optional[dict],
+        page_size: int,
+        start_after: Optional[str] = None
+    ) -> Optional[Tuple[List[dict], bool]]:
+        """
+        Answer an equality-filtered query in document ID order, as Firestore
+        orders it.
+
+        Args:
+            filters: Dict of field -> value equality filters
+            page_size: Maximum documents to return
+            start_after: Document ID to continue after
+
+        Returns:
+            tuple or None: (documents, has_more), or None if the mirror can't
+                answer this query
+        """
+        filters = filters or {}
+        if any(field.startswith('$') or isinstance(value, dict) for field, value in filters.items()):
+            # Composite filters, ranges and other operators go to Firestore
+            return None
+        if not self.ready:
+            return None
+
+        with self._lock:
+            if self._has_pending_writes():
+                return None
+            items = sorted(self._documents.items())
+
+        documents = []
+        has_more = False
+        for doc_id, data in items:
+            if start_after is not None and doc_id <= start_after:
+                continue
+            if not all(_field_equals(data, field, value) for field, value in filters.items()):
+                continue
+            if len(documents) == page_size:
+                has_more = True
+                break
+            document = dict(data)
+            document['_id'] = doc_id
+            documents.append(document)
+        return documents, has_more
+
+    def _check(self, db):
+        """Restart a dropped listener, backing off between attempts."""
+        if self.overflowed:
+            return
+        if self.active:
+            self._reconnect_delay = RECONNECT_DELAY_MIN
+            return
+        now = time.monotonic()
+        if now < self._retry_at:
+            return
+
+        logger.info(f"[MIRROR] Starting listener for {self.collection}")
+        self._retry_at = now + self._reconnect_delay
+        self._reconnect_delay = min(self._reconnect_delay * 2, RECONNECT_DELAY_MAX)
+        try:
+            self.start(db)
+        except Exception as e:
+            logger.warning(f"[MIRROR] Failed to start listener for {self.collection}: {e}")
+
+
+_mirrors = None
+_mirrors_lock = threading.Lock()
+
+
+def _supervise(mirrors: Dict[str, CollectionMirror]):
+    """Keep the listeners of all mirrors connected."""
+    while True:
+        time.sleep(SUPERVISOR_INTERVAL)
+        db = get_db()
+        for mirror in mirrors.values():
+            mirror._check(db)
+
+
+def _start_mirrors() -> Dict[str, CollectionMirror]:
+    """Create mirrors for the configured collections and start listening."""
+    db = get_db()
+    mirrors = {
+        collection: CollectionMirror(collection, max_documents)
+        for collection, max_documents in settings.MCP_MIRROR_COLLECTIONS.items()
+    }
+    for mirror in mirrors.values():
+        mirror._check(db)
+
+    threading.Thread(
+        target=_supervise, args=(mirrors,), name='mcp-mirror-supervisor', daemon=True
+    ).start()
+    return mirrors
+
+
+def get_mirror(collection: str) -> Optional[CollectionMirror]:
+    """
+    Get the mirror for a collection, if it is configured.
+
+    Listeners for all configured collections start on the first call.
+    """
+    global _mirrors
+    if not settings.MCP_MIRROR_COLLECTIONS:
+        return None
+    if _mirrors is None:
+        with _mirrors_lock:
+            if _mirrors is None:
+                _mirrors = _start_mirrors()
+    return _mirrors.get(collection)
+
+
+def note_writes(*paths: str):
+    """Tell the mirrors about documents written by this process."""
+    if _mirrors is None:
+        return
+    for path in paths:
+        collection, _, doc_id = path.rpartition('/')
+        mirror = _mirrors.get(collection)
+        if mirror is not None:
+            mirror.note_write(doc_id)
@@ -0,0 +1,78 @@
+"""
+Progress notifications for long-running MCP tool calls.
+"""
+import contextvars
+from contextlib import contextmanager
+from typing import Optional
+
+# Reporter for the tool call running in the current context, if the client
+# asked for progress updates
+_reporter = contextvars.ContextVar('mcp_progress_reporter', default=None)
+
+
+class ProgressReporter:
+    """Queue MCP notifications/progress messages for one tool call."""
+
+    def __init__(self, progress_token, queue, loop):
+        self.progress_token = progress_token
+        self._queue = queue
+        self._loop = loop
+
+    def report(self, progress: float, total: Optional[float] = None, message: Optional[str] = None):
+        notification = {
+            'jsonrpc': '2.0',
+            'method': 'notifications/progress',
+            'params': {
+                'progressToken': self.progress_token,
+                'progress': progress
+            }
+        }
+        if total is not None:
+            notification['params']['total'] = total
+        if message is not None:
+            notification['params']['message'] = message
+
+        # Tools report from worker threads, so hand off to the event loop
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, notification)
+
+
+@contextmanager
+def progress_scope(progress_token, queue, loop):
+    """Route report_progress() calls in this context to the given queue."""
+    reporter = ProgressReporter(progress_token, queue, loop) if progress_token is not None else None
+    token = _reporter.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _reporter.reset(token)
+
+
+def report_progress(progress: float, total: Optional[float] = None, message: Optional[str] = None):
+    """
+    Report progress for the current tool call.
+
+    This is a no-op unless the call is being streamed and the client sent a
+    progressToken. Safe to call from run_in_executor workers, which run in
+    a copy of the calling context.
+
+    Args:
+        progress: Work done so far
+        total: Total amount of work, if known
+        message: Optional human-readable status
+    """
+    reporter = _reporter.get()
+    if reporter is not None:
+        reporter.report(progress, total, message)
+
+
+def progress_callback():
+    """
+    Return a progress function bound to the current tool call.
+
+    Use this when progress is reported from threads the tool does not own
+    (e.g. SDK callbacks), where the calling context is not propagated.
+    """
+    reporter = _reporter.get()
+    if reporter is None:
+        return lambda progress, total=None, message=None: None
+    return reporter.report
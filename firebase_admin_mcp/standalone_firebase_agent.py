@@ -15,19 +15,25 @@ Based on firebase_agent_mcp.py but completely standalone within the Django app.
 
 from langgraph.graph.message import add_messages
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage, SystemMessage
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 from langgraph.prebuilt import create_react_agent
 from langchain_openai import ChatOpenAI
 import django
+import asyncio
+import functools
 import json
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import time
 import os
 import sys
 import argparse
 import threading
-from typing import Dict, Any, Optional, Sequence, Union
+import weakref
+from typing import Dict, Any, Optional, Sequence, Tuple, Union
 from pydantic import BaseModel
 
 # Add Django project to path for imports
@@ -157,12 +163,22 @@ FA1_PROMPT = (
     "- Retrieve user information\n"
     "- Manage user accounts\n\n"
     "**Firestore Database:**\n"
-    "- List collections\n"
+    "- List collections and document subcollections\n"
+    "- Export a collection or document subtree to NDJSON\n"
     "- Get, create, update, and delete documents\n"
+    "- Fetch many documents at once with a single batched read\n"
+    "- Apply many writes at once with batch_write\n"
+    "- Increment counters and update arrays atomically with field transforms, "
+    "and use transact for conditional multi-document writes instead of reading then writing\n"
+    "- Recursively delete collections (always dry-run first and confirm)\n"
     "- Query collections with filters\n"
+    "- Search a subcollection under every parent at once with a collection group query\n"
+    "- Request only the fields you need with the fields argument\n"
+    "- Count documents and sum or average fields without fetching documents\n"
     "- Manage database operations\n\n"
     "**Firebase Storage:**\n"
     "- Upload and download files\n"
+    "- Read the start (or any byte range) of large files with storage_read_file instead of downloading them\n"
     "- List files with prefix filtering\n"
     "- Delete files from storage\n"
     "- Manage file operations\n\n"
@@ -211,49 +227,185 @@ class StandaloneFirebaseState(BaseModel):
 # =============================================================================
 
 
+# Server responses retried by the client. Only 503 (no server available to
+# take the request) is safe: 500 is a tool execution error, and a 502/504
+# from a proxy can arrive after the server already ran the call, so
+# retrying those could replay a non-idempotent tool call.
+RETRY_STATUS_CODES = (503,)
+
+
 class StandaloneFirebaseMCPClient:
     """Standalone Firebase MCP client for connecting to Firebase MCP server."""
 
-    def __init__(self, mcp_server_url: str = "http://127.0.0.1:8001/mcp/"):
+    def __init__(
+        self,
+        mcp_server_url: str = "http://127.0.0.1:8001/mcp/",
+        result_format: str = "structured",
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: float = 30
+    ):
+        """
+        Args:
+            mcp_server_url: Firebase MCP server endpoint
+            result_format: tools/call result format to request: "structured"
+                (structuredContent only), "both", or "text" (JSON in a string)
+            pool_size: Maximum pooled connections to the server
+            keep_alive: Reuse connections between tool calls
+            max_retries: Retries for failed connection attempts and 503
+            backoff_factor: Exponential backoff factor between retries
+            timeout: Request timeout in seconds
+        """
         self.mcp_server_url = mcp_server_url
+        self.result_format = result_format
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
         self.request_id = 0
+        self.session = self._create_session(
+            pool_size, keep_alive, max_retries, backoff_factor)
         logger.info(
             f"[STANDALONE MCP] Client initialized with server URL: {mcp_server_url}")
 
+    @staticmethod
+    def _create_session(pool_size: int, keep_alive: bool, max_retries: int, backoff_factor: float) -> requests.Session:
+        """Create a pooled HTTP session with a retry policy."""
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            # A read error may mean the call already ran on the server
+            read=0,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({'POST'}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'Content-Type': 'application/json'})
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def _get_next_id(self) -> int:
         """Get next request ID."""
         self.request_id += 1
         logger.debug(f"[REQUEST ID] Generated request ID: {self.request_id}")
         return self.request_id
 
-    def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Call a Firebase MCP tool with comprehensive logging and thinking animation."""
-        request_id = self._get_next_id()
-        start_time = time.time()
-
+    def _build_payload(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the JSON-RPC tools/call request for a tool."""
         logger.info(f"[TOOL CALL] Calling Firebase MCP tool: {tool_name}")
         logger.debug(
             f"[TOOL ARGS] Tool arguments: {json.dumps(arguments, indent=2, default=str)}")
 
-        # Create thinking animation with tool-specific message
-        tool_display_name = tool_name.replace('_', ' ').title()
-        spinner = ThinkingSpinner(f"🔥 Firebase: {tool_display_name}")
-
-        # Only show spinner if not in debug mode (verbosity < 2)
-        show_spinner = logger.level > logging.DEBUG
-
         payload = {
             "jsonrpc": "2.0",
             "method": "tools/call",
             "params": {
                 "name": tool_name,
-                "arguments": arguments
+                "arguments": arguments,
+                "_meta": {"resultFormat": self.result_format}
             },
-            "id": request_id
+            "id": self._get_next_id()
         }
 
         logger.debug(
             f"[MCP REQUEST] MCP Request payload: {json.dumps(payload, indent=2, default=str)}")
+        return payload
+
+    def _handle_response(self, tool_name: str, response) -> Tuple[Any, Optional[str]]:
+        """
+        Turn an HTTP response into a tool result.
+
+        Works with both requests and httpx responses.
+
+        Returns:
+            tuple: (result, failure) where failure is a short reason for
+                the console status line, or None on success
+        """
+        logger.debug(
+            f"[HTTP STATUS] HTTP Response Status: {response.status_code}")
+
+        if response.status_code != 200:
+            logger.error(
+                f"[HTTP ERROR] HTTP request failed with status {response.status_code}")
+            return {
+                "error": f"HTTP request failed with status {response.status_code}",
+                "content": response.text[:500]
+            }, f"HTTP {response.status_code}"
+
+        try:
+            data = response.json()
+        except json.JSONDecodeError as json_error:
+            logger.error(
+                f"[HTTP JSON ERROR] Failed to parse HTTP response: {json_error}")
+            return {
+                "error": "Failed to parse HTTP response",
+                "status_code": response.status_code,
+                "content": response.text[:500]
+            }, "JSON error"
+
+        logger.debug(
+            f"[MCP RESPONSE] Raw MCP Response: {json.dumps(data, indent=2, default=str)}")
+
+        if 'result' in data and 'structuredContent' in data['result']:
+            # Already decoded with the response, no second parse
+            structured = data['result']['structuredContent']
+            if list(structured) == ['result']:
+                # Non-object results are wrapped by the server
+                structured = structured['result']
+            logger.info(f"[SUCCESS] Tool {tool_name} executed successfully")
+            return structured, None
+        elif 'result' in data:
+            result_content = data['result']['content'][0]['text']
+            logger.debug(f"[MCP CONTENT] MCP Result Content: {result_content}")
+
+            try:
+                parsed_result = json.loads(result_content)
+            except json.JSONDecodeError as parse_error:
+                logger.error(
+                    f"[JSON PARSE ERROR] Failed to parse MCP result: {parse_error}")
+                return {
+                    "error": "Failed to parse MCP response",
+                    "raw_content": result_content,
+                    "parse_error": str(parse_error)
+                }, "Parse error"
+
+            logger.info(f"[SUCCESS] Tool {tool_name} executed successfully")
+            return parsed_result, None
+        else:
+            logger.error(f"[MCP ERROR] MCP returned error: {data}")
+            return {"error": "MCP server returned error", "details": data}, "MCP error"
+
+    def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call a Firebase MCP tool with comprehensive logging and thinking animation."""
+        start_time = time.time()
+        payload = self._build_payload(tool_name, arguments)
+
+        # Create thinking animation with tool-specific message
+        tool_display_name = tool_name.replace('_', ' ').title()
+        spinner = ThinkingSpinner(f"🔥 Firebase: {tool_display_name}")
+
+        # Only show spinner if not in debug mode (verbosity < 2)
+        show_spinner = logger.level > logging.DEBUG
 
         try:
             if show_spinner:
@@ -261,86 +413,23 @@ class StandaloneFirebaseMCPClient:
 
             logger.debug(
                 f"[HTTP POST] Sending POST request to: {self.mcp_server_url}")
-            response = requests.post(
+            response = self.session.post(
                 self.mcp_server_url,
                 json=payload,
-                headers={'Content-Type': 'application/json'},
-                timeout=30
+                timeout=self.timeout
             )
 
             elapsed_time = time.time() - start_time
             logger.info(f"[TIMING] Request completed in {elapsed_time:.3f}s")
-            logger.debug(
-                f"[HTTP STATUS] HTTP Response Status: {response.status_code}")
-
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    logger.debug(
-                        f"[MCP RESPONSE] Raw MCP Response: {json.dumps(data, indent=2, default=str)}")
-
-                    if 'result' in data:
-                        result_content = data['result']['content'][0]['text']
-                        logger.debug(
-                            f"[MCP CONTENT] MCP Result Content: {result_content}")
-
-                        try:
-                            parsed_result = json.loads(result_content)
-                            logger.info(
-                                f"[SUCCESS] Tool {tool_name} executed successfully")
-
-                            if show_spinner:
-                                spinner.stop(
-                                    f"✅ {tool_display_name} completed ({elapsed_time:.2f}s)")
-
-                            return parsed_result
-                        except json.JSONDecodeError as parse_error:
-                            logger.error(
-                                f"[JSON PARSE ERROR] Failed to parse MCP result: {parse_error}")
-
-                            if show_spinner:
-                                spinner.stop(
-                                    f"❌ {tool_display_name} failed: Parse error")
-
-                            return {
-                                "error": "Failed to parse MCP response",
-                                "raw_content": result_content,
-                                "parse_error": str(parse_error)
-                            }
-                    else:
-                        logger.error(f"[MCP ERROR] MCP returned error: {data}")
-
-                        if show_spinner:
-                            spinner.stop(
-                                f"❌ {tool_display_name} failed: MCP error")
-
-                        return {"error": "MCP server returned error", "details": data}
-
-                except json.JSONDecodeError as json_error:
-                    logger.error(
-                        f"[HTTP JSON ERROR] Failed to parse HTTP response: {json_error}")
-
-                    if show_spinner:
-                        spinner.stop(
-                            f"❌ {tool_display_name} failed: JSON error")
-
-                    return {
-                        "error": "Failed to parse HTTP response",
-                        "status_code": response.status_code,
-                        "content": response.text[:500]
-                    }
-            else:
-                logger.error(
-                    f"[HTTP ERROR] HTTP request failed with status {response.status_code}")
 
-                if show_spinner:
+            result, failure = self._handle_response(tool_name, response)
+            if show_spinner:
+                if failure:
+                    spinner.stop(f"❌ {tool_display_name} failed: {failure}")
+                else:
                     spinner.stop(
-                        f"❌ {tool_display_name} failed: HTTP {response.status_code}")
-
-                return {
-                    "error": f"HTTP request failed with status {response.status_code}",
-                    "content": response.text[:500]
-                }
+                        f"✅ {tool_display_name} completed ({elapsed_time:.2f}s)")
+            return result
 
         except requests.exceptions.RequestException as req_error:
             elapsed_time = time.time() - start_time
@@ -361,64 +450,230 @@ class StandaloneFirebaseMCPClient:
                 spinner.stop()
 
 
-# Global MCP client instance
+class AsyncStandaloneFirebaseMCPClient(StandaloneFirebaseMCPClient):
+    """
+    Async variant of the Firebase MCP client.
+
+    Tool calls are coroutines sharing one pooled httpx connection pool, so
+    several calls can be in flight at once. There is no console spinner:
+    concurrent calls would draw over each other.
+    """
+
+    @staticmethod
+    def _create_session(pool_size: int, keep_alive: bool, max_retries: int, backoff_factor: float) -> httpx.AsyncClient:
+        """Create a pooled async HTTP client that retries failed connections."""
+        limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size if keep_alive else 0
+        )
+        # httpx only retries connection failures; status retries happen in call_tool
+        transport = httpx.AsyncHTTPTransport(retries=max_retries, limits=limits)
+        return httpx.AsyncClient(
+            transport=transport,
+            headers={'Content-Type': 'application/json'}
+        )
+
+    async def close(self):
+        """Close pooled connections."""
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call a Firebase MCP tool without blocking the event loop."""
+        start_time = time.time()
+        payload = self._build_payload(tool_name, arguments)
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                logger.debug(
+                    f"[HTTP POST] Sending POST request to: {self.mcp_server_url}")
+                response = await self.session.post(
+                    self.mcp_server_url,
+                    json=payload,
+                    timeout=self.timeout
+                )
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                    break
+                logger.warning(
+                    f"[HTTP RETRY] {tool_name} got HTTP {response.status_code}, retrying")
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+            elapsed_time = time.time() - start_time
+            logger.info(f"[TIMING] Request completed in {elapsed_time:.3f}s")
+
+            result, _ = self._handle_response(tool_name, response)
+            return result
+
+        except httpx.HTTPError as req_error:
+            elapsed_time = time.time() - start_time
+            logger.error(
+                f"[REQUEST ERROR] Request failed after {elapsed_time:.3f}s: {req_error}")
+
+            return {
+                "error": "Request to MCP server failed",
+                "exception": str(req_error),
+                "server_url": self.mcp_server_url
+            }
+
+
+# Global MCP client instance, for sync tool calls
 mcp_client = StandaloneFirebaseMCPClient()
 
+# Async MCP clients, one per event loop, since httpx connection pools are
+# bound to the loop that opened them (e.g. each asyncio.run)
+_async_mcp_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_mcp_client() -> AsyncStandaloneFirebaseMCPClient:
+    """Get the async MCP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_mcp_clients.get(loop)
+    if client is None:
+        # Follows the global client's settings, e.g. a --mcp-url override
+        client = AsyncStandaloneFirebaseMCPClient(
+            mcp_server_url=mcp_client.mcp_server_url,
+            result_format=mcp_client.result_format,
+            max_retries=mcp_client.max_retries,
+            backoff_factor=mcp_client.backoff_factor,
+            timeout=mcp_client.timeout
+        )
+        _async_mcp_clients[loop] = client
+    return client
+
+
+async def close_async_mcp_client():
+    """Close the async MCP client of the running event loop, if any."""
+    client = _async_mcp_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
 # =============================================================================
 # FIREBASE TOOLS (with correct tool names for Django MCP server)
 # =============================================================================
 
 
-@tool
-def firebase_health_check():
+def firebase_tool(build):
+    """
+    Register a Firebase MCP tool call as an agent tool.
+
+    build takes the tool's arguments and returns the (tool_name, arguments)
+    to send to the MCP server; its name, signature and docstring describe
+    the tool. The tool runs on the pooled sync client under invoke, and on
+    the async client under ainvoke, where the ReAct agent's tool node runs
+    the tool calls of one step concurrently.
+    """
+    @functools.wraps(build)
+    def call(*args, **kwargs):
+        return mcp_client.call_tool(*build(*args, **kwargs))
+
+    @functools.wraps(build)
+    async def acall(*args, **kwargs):
+        return await get_async_mcp_client().call_tool(*build(*args, **kwargs))
+
+    return StructuredTool.from_function(func=call, coroutine=acall)
+
+
+def _health_status(result) -> Dict[str, Any]:
+    """Turn a list_collections result into a health check report."""
+    logger.debug(
+        f"[HEALTH CHECK] Health check result: {json.dumps(result, indent=2, default=str)}")
+
+    if "error" not in result:
+        health_status = {
+            "status": "healthy",
+            "services": ["authentication", "firestore", "storage"],
+            "collections_count": len(result) if isinstance(result, list) else "unknown",
+            "message": "All Firebase services operational"
+        }
+        logger.info("[HEALTH CHECK SUCCESS] Firebase health check passed")
+        return health_status
+    else:
+        health_status = {
+            "status": "degraded",
+            "error": result.get("error"),
+            "error_details": result,
+            "message": "Firebase services partially available"
+        }
+        logger.warning(
+            f"[HEALTH CHECK WARNING] Firebase health check degraded: {result.get('error')}")
+        return health_status
+
+
+def _health_error(error: Exception) -> Dict[str, Any]:
+    """Health check report for a health check that raised."""
+    logger.error(f"[HEALTH CHECK ERROR] Firebase health check failed: {error}")
+    logger.exception("Health check exception:")
+    return {
+        "status": "error",
+        "error": str(error),
+        "message": "Firebase services unavailable"
+    }
+
+
+def _firebase_health_check():
     """
     Check the health status of Firebase MCP services with detailed logging.
     """
     logger.info("[HEALTH CHECK] Running Firebase health check...")
+    try:
+        return _health_status(mcp_client.call_tool("list_collections", {}))
+    except Exception as e:
+        return _health_error(e)
+
 
+async def _afirebase_health_check():
+    """
+    Check the health status of Firebase MCP services with detailed logging.
+    """
+    logger.info("[HEALTH CHECK] Running Firebase health check...")
     try:
-        result = mcp_client.call_tool("list_collections", {})
-        logger.debug(
-            f"[HEALTH CHECK] Health check result: {json.dumps(result, indent=2, default=str)}")
-
-        if "error" not in result:
-            health_status = {
-                "status": "healthy",
-                "services": ["authentication", "firestore", "storage"],
-                "collections_count": len(result) if isinstance(result, list) else "unknown",
-                "message": "All Firebase services operational"
-            }
-            logger.info("[HEALTH CHECK SUCCESS] Firebase health check passed")
-            return health_status
-        else:
-            health_status = {
-                "status": "degraded",
-                "error": result.get("error"),
-                "error_details": result,
-                "message": "Firebase services partially available"
-            }
-            logger.warning(
-                f"[HEALTH CHECK WARNING] Firebase health check degraded: {result.get('error')}")
-            return health_status
+        return _health_status(
+            await get_async_mcp_client().call_tool("list_collections", {}))
     except Exception as e:
-        health_status = {
-            "status": "error",
-            "error": str(e),
-            "message": "Firebase services unavailable"
-        }
-        logger.error(f"[HEALTH CHECK ERROR] Firebase health check failed: {e}")
-        logger.exception("Health check exception:")
-        return health_status
+        return _health_error(e)
 
 
-@tool
+firebase_health_check = StructuredTool.from_function(
+    func=_firebase_health_check,
+    coroutine=_afirebase_health_check,
+    name="firebase_health_check"
+)
+
+
+@firebase_tool
 def firestore_list_collections():
     """List all collections in Firestore database."""
     logger.info("[FIRESTORE] Listing collections")
-    return mcp_client.call_tool("list_collections", {})
+    return ("list_collections", {})
+
+
+@firebase_tool
+def firestore_list_subcollections(collection: str, document_id: str):
+    """List the subcollections of a Firestore document."""
+    logger.info(
+        f"[FIRESTORE] Listing subcollections of {collection}/{document_id}")
+    return ("list_subcollections", {
+        "collection": collection,
+        "doc_id": document_id
+    })
+
 
+@firebase_tool
+def firestore_export_tree(local_path: str, path: Optional[str] = None):
+    """Export a Firestore collection or document path, with all nested subcollections, to an NDJSON file on the server. local_path is relative to the server's MCP_LOCAL_FILES_ROOT. Omit path to export the whole database."""
+    logger.info(f"[FIRESTORE] Exporting {path or 'database'} to {local_path}")
+    arguments = {"local_path": local_path}
+    if path:
+        arguments["path"] = path
+    return ("export_tree", arguments)
 
-@tool
+
+@firebase_tool
 def firestore_create_document(collection: str, data: dict, document_id: Optional[str] = None):
     """Create a new document in a Firestore collection."""
     logger.info(f"[FIRESTORE] Creating document in collection: {collection}")
@@ -428,119 +683,236 @@ def firestore_create_document(collection: str, data: dict, document_id: Optional
     }
     if document_id:
         arguments["document_id"] = document_id
-    return mcp_client.call_tool("create_document", arguments)
+    return ("create_document", arguments)
 
 
-@tool
-def firestore_get_document(collection: str, document_id: str):
-    """Get a document from a Firestore collection."""
+@firebase_tool
+def firestore_get_document(collection: str, document_id: str, fields: Optional[list] = None):
+    """Get a document from a Firestore collection. Pass fields to return only those field paths."""
     logger.info(
         f"[FIRESTORE] Getting document {document_id} from collection {collection}")
-    return mcp_client.call_tool("get_document", {
+    arguments = {
         "collection": collection,
         "document_id": document_id
-    })
+    }
+    if fields:
+        arguments["fields"] = fields
+    return ("get_document", arguments)
+
 
+@firebase_tool
+def firestore_get_documents(documents: list, fields: Optional[list] = None):
+    """Get several Firestore documents in one call. Each item is {"collection": ..., "doc_id": ...}. Pass fields to return only those field paths."""
+    logger.info(f"[FIRESTORE] Getting {len(documents)} documents in one batch")
+    arguments = {"documents": documents}
+    if fields:
+        arguments["fields"] = fields
+    return ("get_documents", arguments)
 
-@tool
+
+@firebase_tool
 def firestore_update_document(collection: str, document_id: str, data: dict):
     """Update a document in a Firestore collection."""
     logger.info(
         f"[FIRESTORE] Updating document {document_id} in collection {collection}")
-    return mcp_client.call_tool("update_document", {
+    return ("update_document", {
         "collection": collection,
         "document_id": document_id,
         "data": data
     })
 
 
-@tool
+@firebase_tool
 def firestore_delete_document(collection: str, document_id: str):
     """Delete a document from a Firestore collection."""
     logger.info(
         f"[FIRESTORE] Deleting document {document_id} from collection {collection}")
-    return mcp_client.call_tool("delete_document", {
+    return ("delete_document", {
         "collection": collection,
         "document_id": document_id
     })
 
 
-@tool
-def firestore_query_collection(collection: str, filters: Optional[dict] = None, limit: Optional[int] = None):
-    """Query documents in a Firestore collection with optional filters."""
+@firebase_tool
+def firestore_transact(operations: list, conditions: Optional[list] = None):
+    """Apply writes atomically in a Firestore transaction, only if all conditions hold. Operations are as for firestore_batch_write; data values can be transforms like {"$increment": 1} or {"$arrayUnion": ["x"]}. Each condition is {"collection": ..., "doc_id": ..., "field": ..., "op": ">=", "value": ...} or {"collection": ..., "doc_id": ..., "exists": true}."""
+    logger.info(
+        f"[FIRESTORE] Running transaction with {len(operations)} writes")
+    arguments = {"operations": operations}
+    if conditions:
+        arguments["conditions"] = conditions
+    return ("transact", arguments)
+
+
+@firebase_tool
+def firestore_delete_collection(path: str, dry_run: bool = True):
+    """Recursively delete a Firestore collection, or a document with all its subcollections. Runs as a dry run (count only) unless dry_run is False; confirm with the user before deleting."""
+    logger.info(f"[FIRESTORE] Deleting {path} (dry run: {dry_run})")
+    return ("delete_collection", {
+        "path": path,
+        "dry_run": dry_run
+    })
+
+
+@firebase_tool
+def firestore_batch_write(operations: list, atomic: Optional[bool] = None):
+    """Apply many Firestore writes in one call. Each operation is {"op": "create"|"set"|"update"|"delete", "collection": ..., "doc_id": ..., "data": {...}}."""
+    logger.info(f"[FIRESTORE] Applying {len(operations)} writes in one batch")
+    arguments = {"operations": operations}
+    if atomic is not None:
+        arguments["atomic"] = atomic
+    return ("batch_write", arguments)
+
+
+@firebase_tool
+def firestore_query_collection(collection: str, filters: Optional[dict] = None, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[list] = None):
+    """Query one page of documents in a Firestore collection with optional filters, e.g. {"status": "active", "age": {">=": 18}} or {"$or": [{"status": "active"}, {"role": {"in": ["admin"]}}]}. Pass the returned next_cursor to get the next page, and fields to return only those field paths."""
     logger.info(f"[FIRESTORE] Querying collection: {collection}")
     arguments = {"collection": collection}
     if filters:
         arguments["filters"] = filters
     if limit:
         arguments["limit"] = limit
-    return mcp_client.call_tool("query_collection", arguments)
+    if cursor:
+        arguments["cursor"] = cursor
+    if fields:
+        arguments["fields"] = fields
+    return ("query_collection", arguments)
+
+
+@firebase_tool
+def firestore_query_collection_group(collection_id: str, filters: Optional[dict] = None, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[list] = None):
+    """Query all collections named collection_id at any nesting level (e.g. every user's "orders" subcollection) in one query. Filters work as in firestore_query_collection; each document has its full _path."""
+    logger.info(f"[FIRESTORE] Querying collection group: {collection_id}")
+    arguments = {"collection_id": collection_id}
+    if filters:
+        arguments["filters"] = filters
+    if limit:
+        arguments["limit"] = limit
+    if cursor:
+        arguments["cursor"] = cursor
+    if fields:
+        arguments["fields"] = fields
+    return ("query_collection_group", arguments)
 
 
-@tool
-def storage_list_files(prefix: Optional[str] = None):
-    """List files in Firebase Storage with optional prefix filter."""
+@firebase_tool
+def firestore_count_documents(collection: str, filters: Optional[dict] = None):
+    """Count documents in a Firestore collection matching optional filters, without fetching them."""
+    logger.info(f"[FIRESTORE] Counting documents in collection: {collection}")
+    arguments = {"collection": collection}
+    if filters:
+        arguments["filters"] = filters
+    return ("count_documents", arguments)
+
+
+@firebase_tool
+def firestore_sum_field(collection: str, field: str, filters: Optional[dict] = None):
+    """Sum a numeric field over documents in a Firestore collection matching optional filters."""
+    logger.info(f"[FIRESTORE] Summing {field} in collection: {collection}")
+    arguments = {"collection": collection, "field": field}
+    if filters:
+        arguments["filters"] = filters
+    return ("sum_field", arguments)
+
+
+@firebase_tool
+def firestore_avg_field(collection: str, field: str, filters: Optional[dict] = None):
+    """Average a numeric field over documents in a Firestore collection matching optional filters."""
+    logger.info(f"[FIRESTORE] Averaging {field} in collection: {collection}")
+    arguments = {"collection": collection, "field": field}
+    if filters:
+        arguments["filters"] = filters
+    return ("avg_field", arguments)
+
+
+@firebase_tool
+def storage_list_files(
+    prefix: Optional[str] = None,
+    delimiter: Optional[str] = None,
+    page_token: Optional[str] = None,
+    include_metadata: bool = False
+):
+    """List one page of files in Firebase Storage with optional prefix filter. Use delimiter="/" to browse one folder level (subfolders come back in "prefixes"), include_metadata for size/updated/md5, and pass next_page_token back as page_token for more."""
     logger.info(f"[STORAGE] Listing files with prefix: {prefix}")
     arguments = {}
     if prefix:
         arguments["prefix"] = prefix
-    return mcp_client.call_tool("list_files", arguments)
-
-
-@tool
-def storage_upload_file(file_path: str, destination_path: str):
-    """Upload a file to Firebase Storage."""
-    logger.info(f"[STORAGE] Uploading file {file_path} to {destination_path}")
-    return mcp_client.call_tool("upload_file", {
+    if delimiter:
+        arguments["delimiter"] = delimiter
+    if page_token:
+        arguments["page_token"] = page_token
+    if include_metadata:
+        arguments["include_metadata"] = True
+    return ("list_files", arguments)
+
+
+@firebase_tool
+def storage_upload_file(local_path: str, file_path: str, content_type: Optional[str] = None):
+    """Upload the server file at local_path, relative to the server's MCP_LOCAL_FILES_ROOT, to file_path in Firebase Storage."""
+    logger.info(f"[STORAGE] Uploading file {local_path} to {file_path}")
+    arguments = {"file_path": file_path, "local_path": local_path}
+    if content_type:
+        arguments["content_type"] = content_type
+    return ("upload_file", arguments)
+
+
+@firebase_tool
+def storage_download_file(file_path: str, local_path: str):
+    """Download file_path from Firebase Storage and save it to local_path, relative to the server's MCP_LOCAL_FILES_ROOT."""
+    logger.info(
+        f"[STORAGE] Downloading file {file_path} to {local_path}")
+    return ("download_file", {
         "file_path": file_path,
-        "destination_path": destination_path
+        "local_path": local_path
     })
 
 
-@tool
-def storage_download_file(file_path: str, destination_path: str):
-    """Download a file from Firebase Storage."""
+@firebase_tool
+def storage_read_file(file_path: str, start: int = 0, max_bytes: int = 4096):
+    """Read up to max_bytes of a file in Firebase Storage from byte offset start, without downloading the rest. Returns base64 "data" and the total "size" of the file, so you can read further ranges."""
     logger.info(
-        f"[STORAGE] Downloading file {file_path} to {destination_path}")
-    return mcp_client.call_tool("download_file", {
+        f"[STORAGE] Reading {max_bytes} bytes of {file_path} from offset {start}")
+    return ("download_file", {
         "file_path": file_path,
-        "destination_path": destination_path
+        "start": start,
+        "max_bytes": max_bytes
     })
 
 
-@tool
+@firebase_tool
 def storage_delete_file(file_path: str):
     """Delete a file from Firebase Storage."""
     logger.info(f"[STORAGE] Deleting file: {file_path}")
-    return mcp_client.call_tool("delete_file", {
+    return ("delete_file", {
         "file_path": file_path
     })
 
 
-@tool
+@firebase_tool
 def firebase_verify_token(id_token: str):
     """Verify a Firebase ID token."""
     logger.info("[AUTH] Verifying Firebase ID token")
-    return mcp_client.call_tool("verify_id_token", {
+    return ("verify_id_token", {
         "id_token": id_token
     })
 
 
-@tool
+@firebase_tool
 def firebase_create_custom_token(uid: str, additional_claims: Optional[dict] = None):
     """Create a custom Firebase authentication token."""
     logger.info(f"[AUTH] Creating custom token for UID: {uid}")
     arguments = {"uid": uid}
     if additional_claims:
         arguments["additional_claims"] = additional_claims
-    return mcp_client.call_tool("create_custom_token", arguments)
+    return ("create_custom_token", arguments)
 
 
-@tool
+@firebase_tool
 def firebase_get_user(uid: str):
     """Get user information by UID."""
     logger.info(f"[AUTH] Getting user information for UID: {uid}")
-    return mcp_client.call_tool("get_user", {
+    return ("get_user", {
         "uid": uid
     })
 
@@ -557,6 +929,9 @@ def create_standalone_firebase_agent():
     """
     Creates a standalone Firebase agent instance for backend operations with detailed logging.
 
+    The Firebase tools work with both invoke and ainvoke; ainvoke runs the
+    tool calls of each agent step concurrently.
+
     Returns:
         An instance of a LangGraph React agent configured with Firebase tools
     """
@@ -582,14 +957,25 @@ def create_standalone_firebase_agent():
     tools = [
         firebase_health_check,
         firestore_list_collections,
+        firestore_list_subcollections,
+        firestore_export_tree,
         firestore_create_document,
         firestore_get_document,
+        firestore_get_documents,
         firestore_update_document,
         firestore_delete_document,
+        firestore_batch_write,
+        firestore_transact,
+        firestore_delete_collection,
         firestore_query_collection,
+        firestore_query_collection_group,
+        firestore_count_documents,
+        firestore_sum_field,
+        firestore_avg_field,
         storage_list_files,
         storage_upload_file,
         storage_download_file,
+        storage_read_file,
         storage_delete_file,
         firebase_verify_token,
         firebase_create_custom_token,
@@ -639,6 +1025,10 @@ def run_standalone_firebase_agent():
 
     logger.info("[SERVICES OK] All Firebase services available")
 
+    # One event loop for the whole session, so the async MCP client keeps
+    # its pooled connections between turns
+    runner = asyncio.Runner()
+
     while True:
         try:
             user_msg = input("> ")
@@ -663,10 +1053,11 @@ def run_standalone_firebase_agent():
             spinner = ThinkingSpinner("🤔 Firebase Agent is processing")
             spinner.start()
 
-            response = agent_instance.invoke(
+            # ainvoke runs the tool calls of each agent step concurrently
+            response = runner.run(agent_instance.ainvoke(
                 {"messages": list(state.messages)},
                 {"recursion_limit": 10, "max_iterations": 5}
-            )
+            ))
 
             # Stop thinking spinner
             spinner.stop("✅ Processing complete")
@@ -718,6 +1109,10 @@ def run_standalone_firebase_agent():
             logger.exception("Full exception traceback:")
             print(f"\n❌ Error: {error_msg}\n")
 
+    runner.run(close_async_mcp_client())
+    mcp_client.close()
+    runner.close()
+
 # =============================================================================
 # ARGUMENT PARSING
 # =============================================================================
@@ -0,0 +1,157 @@
+"""
+Tests for the live collection mirrors.
+"""
+import time
+from unittest.mock import Mock
+
+from google.cloud.firestore_v1.watch import ChangeType
+
+
+def _doc(doc_id, data):
+    doc = Mock()
+    doc.id = doc_id
+    doc.to_dict.side_effect = lambda: dict(data)
+    return doc
+
+
+def _change(change_type, doc_id, data=None):
+    change = Mock()
+    change.type = change_type
+    change.document = _doc(doc_id, data or {})
+    return change
+
+
+def _mirror(docs, max_documents=100):
+    """Build a connected mirror synced to docs ({doc_id: data})."""
+    from ..mirror import CollectionMirror
+
+    mirror = CollectionMirror('config', max_documents)
+    mirror._watch = Mock(is_active=True)
+    mirror._on_snapshot([_doc(doc_id, data) for doc_id, data in docs.items()], [], None)
+    return mirror
+
+
+def test_mirror_snapshots():
+    """Test the first snapshot rebuilds the mirror and later ones apply changes."""
+    from ..mirror import CollectionMirror
+
+    mirror = CollectionMirror('config', 100)
+    assert mirror.get('a') is None  # not connected yet
+
+    mirror = _mirror({'a': {'v': 1}, 'b': {'v': 2}})
+    assert mirror.get('a') == {'v': 1, '_id': 'a'}
+    assert mirror.get('missing') == {}
+
+    mirror._on_snapshot([], [
+        _change(ChangeType.MODIFIED, 'a', {'v': 10}),
+        _change(ChangeType.REMOVED, 'b'),
+        _change(ChangeType.ADDED, 'c', {'v': 3}),
+    ], None)
+    assert mirror.get('a') == {'v': 10, '_id': 'a'}
+    assert mirror.get('b') == {}
+    assert mirror.get('c') == {'v': 3, '_id': 'c'}
+
+    # Returned documents are copies
+    mirror.get('a')['v'] = 99
+    assert mirror.get('a')['v'] == 10
+
+    # A dropped listener stops serving reads
+    mirror._watch.is_active = False
+    assert mirror.get('a') is None
+    print("✓ mirror snapshot test passed")
+
+
+def test_mirror_pending_writes():
+    """Test local writes are read from Firestore until the listener confirms them."""
+    mirror = _mirror({'a': {'v': 1}, 'b': {'v': 2}})
+    mirror.note_write('a')
+    assert mirror.get('a') is None
+    assert mirror.get('b') == {'v': 2, '_id': 'b'}
+    assert mirror.query({}, 10) is None
+
+    mirror._on_snapshot([], [_change(ChangeType.MODIFIED, 'a', {'v': 5})], None)
+    assert mirror.get('a') == {'v': 5, '_id': 'a'}
+    assert mirror.query({}, 10) is not None
+
+    # Unconfirmed writes stop blocking the mirror once they time out
+    mirror.note_write('b')
+    mirror._pending_writes['b'] = time.monotonic() - 1
+    assert mirror.get('b') == {'v': 2, '_id': 'b'}
+    print("✓ mirror pending writes test passed")
+
+
+def test_mirror_query():
+    """Test equality queries page through documents in ID order."""
+    mirror = _mirror({
+        'c': {'status': 'active', 'meta': {'tier': 'gold'}},
+        'a': {'status': 'active', 'meta': {'tier': 'free'}},
+        'b': {'status': 'inactive'},
+        'd': {'status': 'active', 'flag': True},
+        'e': {'flag': 1},
+    })
+
+    documents, has_more = mirror.query({'status': 'active'}, 2)
+    assert [doc['_id'] for doc in documents] == ['a', 'c']
+    assert has_more
+
+    documents, has_more = mirror.query({'status': 'active'}, 2, start_after='c')
+    assert [doc['_id'] for doc in documents] == ['d']
+    assert not has_more
+
+    documents, _ = mirror.query({'meta.tier': 'gold'}, 10)
+    assert [doc['_id'] for doc in documents] == ['c']
+
+    # Booleans never equal numbers, as in Firestore
+    documents, _ = mirror.query({'flag': 1}, 10)
+    assert [doc['_id'] for doc in documents] == ['e']
+
+    # Operators and composite filters are left to Firestore
+    assert mirror.query({'status': {'!=': 'active'}}, 10) is None
+    assert mirror.query({'$or': [{'status': 'active'}]}, 10) is None
+    print("✓ mirror query test passed")
+
+
+def test_mirror_overflow():
+    """Test a collection over its document limit turns the mirror off."""
+    mirror = _mirror({'a': {}, 'b': {}}, max_documents=2)
+    assert mirror.get('a') == {'_id': 'a'}
+
+    watch = mirror._watch
+    mirror._on_snapshot([_doc(doc_id, {}) for doc_id in 'abc'], [], None)
+    assert mirror.overflowed
+    assert mirror.get('a') is None
+    assert mirror.query({}, 10) is None
+
+    # The listener is closed off the callback thread
+    for _ in range(100):
+        if watch.unsubscribe.called:
+            break
+        time.sleep(0.01)
+    assert watch.unsubscribe.called
+
+    # An overflowed mirror is never restarted
+    db = Mock()
+    mirror._check(db)
+    assert not db.collection.called
+    print("✓ mirror overflow test passed")
+
+
+def run_tests():
+    """Run all tests."""
+    try:
+        test_mirror_snapshots()
+        test_mirror_pending_writes()
+        test_mirror_query()
+        test_mirror_overflow()
+        print("All tests passed!")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    print("Running mirror tests...")
+    run_tests()
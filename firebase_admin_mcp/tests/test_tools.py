@@ -2,7 +2,7 @@
 Tests for Firebase MCP tools.
 """
 import asyncio
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 
 async def test_get_document():
@@ -17,13 +17,13 @@ async def test_get_document():
     mock_doc.id = 'test_doc_id'
 
     mock_doc_ref = Mock()
-    mock_doc_ref.get.return_value = mock_doc
+    mock_doc_ref.get = AsyncMock(return_value=mock_doc)
 
     mock_collection = Mock()
     mock_collection.document.return_value = mock_doc_ref
 
-    # Patch the get_db function
-    with patch('firebase_admin_mcp.firebase_init.get_db') as mock_get_db:
+    # Patch the async Firestore client
+    with patch('firebase_admin_mcp.tools.firestore.get_async_db') as mock_get_db:
         mock_db = Mock()
         mock_db.collection.return_value = mock_collection
         mock_get_db.return_value = mock_db
@@ -50,12 +50,12 @@ async def test_get_document_not_found():
     mock_doc.exists = False
 
     mock_doc_ref = Mock()
-    mock_doc_ref.get.return_value = mock_doc
+    mock_doc_ref.get = AsyncMock(return_value=mock_doc)
 
     mock_collection = Mock()
     mock_collection.document.return_value = mock_doc_ref
 
-    with patch('firebase_admin_mcp.firebase_init.get_db') as mock_get_db:
+    with patch('firebase_admin_mcp.tools.firestore.get_async_db') as mock_get_db:
         mock_db = Mock()
         mock_db.collection.return_value = mock_collection
         mock_get_db.return_value = mock_db
@@ -68,11 +68,727 @@ async def test_get_document_not_found():
         print("✓ get_document_not_found test passed")
 
 
+async def test_get_documents():
+    """Test get_documents keeps input order and marks missing documents."""
+    from ..tools.firestore import get_documents
+
+    def _snapshot(path, doc_id, data):
+        snap = Mock()
+        snap.exists = data is not None
+        snap.id = doc_id
+        snap.reference.path = path
+        snap.to_dict.return_value = data
+        return snap
+
+    def _document(collection):
+        def _ref(doc_id):
+            ref = Mock()
+            ref.path = f'{collection}/{doc_id}'
+            return ref
+        mock_collection = Mock()
+        mock_collection.document.side_effect = _ref
+        return mock_collection
+
+    async def _get_all(refs, field_paths=None):
+        # Snapshots come back in a different order than requested
+        yield _snapshot('users/b', 'b', {'name': 'B'})
+        yield _snapshot('users/missing', 'missing', None)
+        yield _snapshot('users/a', 'a', {'name': 'A'})
+
+    with patch('firebase_admin_mcp.tools.firestore.get_async_db') as mock_get_db:
+        mock_db = Mock()
+        mock_db.collection.side_effect = _document
+        mock_db.get_all = Mock(side_effect=_get_all)
+        mock_get_db.return_value = mock_db
+
+        result = await get_documents([
+            {'collection': 'users', 'doc_id': 'a'},
+            {'collection': 'users', 'doc_id': 'missing'},
+            {'collection': 'users', 'doc_id': 'b'},
+        ])
+
+        assert result == [
+            {'name': 'A', '_id': 'a'},
+            {'_id': 'missing', '_collection': 'users', '_missing': True},
+            {'name': 'B', '_id': 'b'},
+        ]
+        assert mock_db.get_all.call_count == 1
+        print("✓ get_documents test passed")
+
+
+async def test_batch_write_bulk():
+    """Test bulk batch_write reports written, failed and dropped writes."""
+    from ..tools.firestore import batch_write
+
+    class FakeBulkWriter:
+        def __init__(self):
+            self.refs = []
+
+        def on_write_result(self, callback):
+            self._on_result = callback
+
+        def on_write_error(self, callback):
+            self._on_error = callback
+
+        def set(self, ref, data, merge=False):
+            self.refs.append(ref)
+
+        def close(self):
+            # First write succeeds, second fails for good, and the third is
+            # in a batch whose commit RPC failed, so no callback fires
+            self._on_result(self.refs[0], Mock(), self)
+            failure = Mock(code=7, attempts=1, message='permission denied')
+            failure.operation.reference = self.refs[1]
+            self._on_error(failure, self)
+
+    def _document(doc_id):
+        ref = Mock()
+        ref.id = doc_id
+        ref.path = f'users/{doc_id}'
+        return ref
+
+    with patch('firebase_admin_mcp.tools.firestore.get_db') as mock_get_db:
+        mock_db = Mock()
+        mock_db.collection.return_value.document.side_effect = _document
+        mock_db.bulk_writer.return_value = FakeBulkWriter()
+        mock_get_db.return_value = mock_db
+
+        result = await batch_write([
+            {'op': 'set', 'collection': 'users', 'doc_id': doc_id, 'data': {'n': 1}}
+            for doc_id in ('a', 'b', 'c')
+        ], atomic=False)
+
+        assert result['mode'] == 'bulk'
+        assert result['written'] == 1
+        assert result['failed'] == 2
+        assert [r['status'] for r in result['results']] == ['ok', 'error', 'error']
+        assert result['results'][1]['code'] == 7
+        assert result['results'][2]['doc_id'] == 'c'
+        print("✓ batch_write bulk test passed")
+
+
+async def test_delete_collection():
+    """Test delete_collection dry runs and counts failed and dropped deletes."""
+    from google.cloud.firestore import CollectionReference
+    from ..tools.firestore import delete_collection
+
+    def _collection(count):
+        col = Mock(spec=CollectionReference)
+        col.recursive.return_value.count.return_value.get.return_value = [[Mock(value=count)]]
+        return col
+
+    class FakeBulkWriter:
+        def on_write_result(self, callback):
+            self._on_result = callback
+
+        def on_write_error(self, callback):
+            self._on_error = callback
+
+    def _recursive_delete(reference, bulk_writer, chunk_size):
+        # Two deletes succeed and one fails for good; the last two were in
+        # a batch whose commit RPC failed, so no callback fires for them
+        for doc_id in ('a', 'b'):
+            bulk_writer._on_result(Mock(path=f'users/{doc_id}'), Mock(), bulk_writer)
+        bulk_writer._on_error(Mock(code=7, attempts=1), bulk_writer)
+        return 5
+
+    with patch('firebase_admin_mcp.tools.firestore.get_db') as mock_get_db:
+        mock_db = Mock()
+        mock_db.collection.return_value = _collection(42)
+        # A document counts itself plus everything in its subcollections
+        mock_db.document.return_value.collections.return_value = [_collection(3), _collection(4)]
+        mock_db.bulk_writer.return_value = FakeBulkWriter()
+        mock_db.recursive_delete.side_effect = _recursive_delete
+        mock_get_db.return_value = mock_db
+
+        result = await delete_collection('users', dry_run=True)
+        assert result == {'path': 'users', 'dry_run': True, 'documents': 42}
+        result = await delete_collection('users/abc', dry_run=True)
+        assert result['documents'] == 8
+        assert not mock_db.recursive_delete.called
+
+        result = await delete_collection('users')
+        assert result == {'path': 'users', 'dry_run': False, 'deleted': 2, 'failed': 3}
+
+    # Cache invalidation is batched; mirrors hear about every document
+    def _delete_five(reference, bulk_writer, chunk_size):
+        for doc_id in 'abcde':
+            bulk_writer._on_result(Mock(path=f'users/{doc_id}'), Mock(), bulk_writer)
+        return 5
+
+    with patch('firebase_admin_mcp.tools.firestore.get_db') as mock_get_db, \
+            patch('firebase_admin_mcp.tools.firestore.get_document_cache') as mock_get_cache, \
+            patch('firebase_admin_mcp.tools.firestore.note_writes') as mock_note_writes, \
+            patch('firebase_admin_mcp.tools.firestore.INVALIDATE_BATCH_SIZE', 2):
+        mock_db = mock_get_db.return_value
+        mock_db.collection.return_value = _collection(5)
+        mock_db.bulk_writer.return_value = FakeBulkWriter()
+        mock_db.recursive_delete.side_effect = _delete_five
+
+        result = await delete_collection('users')
+        assert result['deleted'] == 5
+        invalidated = [call.args for call in mock_get_cache.return_value.invalidate.call_args_list]
+        assert invalidated == [
+            ('users/a', 'users/b'), ('users/c', 'users/d'), ('users/e',)]
+        assert mock_note_writes.call_count == 5
+    print("✓ delete_collection test passed")
+
+
+async def test_export_tree():
+    """Test export_tree walks nested subcollections and surfaces errors."""
+    import json
+    import os
+    import tempfile
+    from django.test import override_settings
+    from ..tools.firestore import export_tree
+
+    tree = {
+        'users': {
+            'u1': {'orders': {'o1': {}, 'o2': {}}},
+            'u2': {'orders': {'o3': {}}},
+        },
+        'config': {'app': {}},
+    }
+
+    def _collection(path, documents):
+        col = Mock()
+        col.id = path.rsplit('/', 1)[-1]
+        col.list_documents.side_effect = lambda page_size=None: [
+            _document(f'{path}/{doc_id}', subcollections)
+            for doc_id, subcollections in documents.items()
+        ]
+        return col
+
+    def _document(path, subcollections):
+        ref = Mock()
+        ref.path = path
+        ref.collections.side_effect = lambda: [
+            _collection(f'{path}/{col_id}', documents)
+            for col_id, documents in subcollections.items()
+        ]
+        return ref
+
+    def _get_all(refs, fail_on=None):
+        snapshots = []
+        for ref in refs:
+            if ref.path == fail_on:
+                raise RuntimeError('get_all failed')
+            snap = Mock()
+            snap.exists = True
+            snap.reference.path = ref.path
+            snap.to_dict.return_value = {'path': ref.path}
+            snapshots.append(snap)
+        return snapshots
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            override_settings(MCP_LOCAL_FILES_ROOT=tmp), \
+            patch('firebase_admin_mcp.tools.firestore.EXPORT_BATCH_SIZE', 1), \
+            patch('firebase_admin_mcp.tools.firestore.get_db') as mock_get_db:
+        mock_db = Mock()
+        mock_db.collections.side_effect = lambda: [
+            _collection(col_id, documents) for col_id, documents in tree.items()]
+        mock_db.get_all.side_effect = _get_all
+        mock_get_db.return_value = mock_db
+
+        local_path = os.path.join(tmp, 'export.ndjson')
+        for max_concurrency in (1, 4):
+            # A lost completion would hang, so bound the wait
+            result = await asyncio.wait_for(
+                export_tree(local_path, max_concurrency=max_concurrency), timeout=10)
+            assert result['documents'] == 6
+            assert result['collections'] == 4
+            with open(local_path) as f:
+                paths = sorted(json.loads(line)['path'] for line in f)
+            assert paths == sorted([
+                'users/u1', 'users/u2', 'users/u1/orders/o1', 'users/u1/orders/o2',
+                'users/u2/orders/o3', 'config/app'])
+
+        mock_db.get_all.side_effect = lambda refs: _get_all(refs, fail_on='users/u2/orders/o3')
+        try:
+            await asyncio.wait_for(
+                export_tree(local_path, max_concurrency=2), timeout=10)
+        except RuntimeError as e:
+            assert str(e) == 'get_all failed'
+        else:
+            raise AssertionError("export_tree should raise the get_all error")
+        print("✓ export_tree test passed")
+
+
+async def test_local_paths():
+    """Test local_path arguments are confined to MCP_LOCAL_FILES_ROOT."""
+    import os
+    import tempfile
+    from django.test import override_settings
+    from ..tools.firestore import export_tree
+    from ..tools.storage import download_file, upload_file
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch('firebase_admin_mcp.tools.storage.get_bucket') as mock_get_bucket, \
+            patch('firebase_admin_mcp.tools.firestore.get_db') as mock_get_db:
+        root = os.path.join(tmp, 'files')
+        secret = os.path.join(tmp, 'serviceAccountKey.json')
+        with open(secret, 'w') as f:
+            f.write('{}')
+        os.makedirs(root)
+        os.symlink(secret, os.path.join(root, 'link.json'))
+
+        with override_settings(MCP_LOCAL_FILES_ROOT=root):
+            for path in (secret, '../serviceAccountKey.json', 'link.json', '.', 'a/../../x'):
+                for call in (
+                    upload_file('f', local_path=path),
+                    download_file('f', local_path=path),
+                    download_file('f', local_path=path, max_bytes=10),
+                    export_tree(path),
+                ):
+                    try:
+                        await call
+                    except ValueError as e:
+                        assert 'MCP_LOCAL_FILES_ROOT' in str(e)
+                    else:
+                        raise AssertionError(f"{path} outside the root should be rejected")
+            # Rejected before any Firebase call or file write
+            mock_get_bucket.assert_not_called()
+            mock_get_db.assert_not_called()
+            assert sorted(os.listdir(root)) == ['link.json']
+
+            blob = mock_get_bucket.return_value.blob.return_value
+            blob.public_url = 'https://example.com/f'
+            assert await upload_file('f', local_path='sub/../data.csv') == 'https://example.com/f'
+            blob.upload_from_filename.assert_called_once_with(
+                os.path.join(os.path.realpath(root), 'data.csv'), content_type=None)
+    print("✓ local path test passed")
+
+
+async def test_download_range():
+    """Test ranged downloads are clamped to the file before any request."""
+    import base64
+    import os
+    import tempfile
+    from django.test import override_settings
+    from ..tools.storage import download_file
+
+    def _blob(size):
+        blob = Mock()
+        blob.size = size
+        blob.download_as_bytes.side_effect = lambda start, end: b'x' * (end - start + 1)
+        return blob
+
+    with patch('firebase_admin_mcp.tools.storage.get_bucket') as mock_get_bucket:
+        bucket = mock_get_bucket.return_value
+        cases = [
+            # (size, kwargs, requested (start, end) or None, reported end, bytes)
+            (100, {'start': 90, 'end': 200}, (90, 99), 99, 10),
+            (100, {'start': 10, 'end': 50, 'max_bytes': 5}, (10, 14), 14, 5),
+            (100, {'start': 10, 'end': 12, 'max_bytes': 50}, (10, 12), 12, 3),
+            (100, {'max_bytes': 4096}, (0, 99), 99, 100),
+            (100, {'start': 100}, None, None, 0),
+            (100, {'start': 150, 'max_bytes': 10}, None, None, 0),
+            (0, {'max_bytes': 10}, None, None, 0),
+        ]
+        for size, kwargs, requested, end, length in cases:
+            blob = _blob(size)
+            bucket.get_blob.return_value = blob
+            result = await download_file('logs/app.log', **kwargs)
+            if requested is None:
+                blob.download_as_bytes.assert_not_called()
+            else:
+                blob.download_as_bytes.assert_called_once_with(
+                    start=requested[0], end=requested[1])
+            assert result == {
+                'file_path': 'logs/app.log',
+                'start': kwargs.get('start', 0),
+                'end': end,
+                'bytes': length,
+                'size': size,
+                'data': base64.b64encode(b'x' * length).decode('utf-8')
+            }, (size, kwargs, result)
+
+        # Ranges saved to disk use the same clamped offsets
+        with tempfile.TemporaryDirectory() as tmp, override_settings(MCP_LOCAL_FILES_ROOT=tmp):
+            blob = _blob(100)
+            bucket.get_blob.return_value = blob
+            result = await download_file('logs/app.log', local_path='tail.log', start=95, end=500)
+            blob.download_to_filename.assert_called_once_with(
+                os.path.join(os.path.realpath(tmp), 'tail.log'), start=95, end=99)
+            assert result['bytes'] == 5 and result['size'] == 100
+
+            blob = _blob(100)
+            bucket.get_blob.return_value = blob
+            result = await download_file('logs/app.log', local_path='empty.log', start=100)
+            blob.download_to_filename.assert_not_called()
+            assert result['bytes'] == 0
+            assert os.path.getsize(os.path.join(tmp, 'empty.log')) == 0
+
+        bucket.get_blob.return_value = None
+        try:
+            await download_file('missing.log', max_bytes=10)
+        except FileNotFoundError:
+            pass
+        else:
+            raise AssertionError("download_file should raise for a missing file")
+
+        for kwargs in ({'start': -1}, {'start': 10, 'end': 5}, {'max_bytes': 0}):
+            try:
+                await download_file('logs/app.log', **kwargs)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"download_file should reject {kwargs}")
+    print("✓ download range test passed")
+
+
+async def test_get_document_cache():
+    """Test get_document serves repeat reads from the cache until a write."""
+    from ..cache import DocumentCache
+    from ..tools.firestore import get_document, update_document
+
+    # In-process LRU, then a Django cache backend (locmem by default)
+    for backend in (None, 'default'):
+        mock_doc = Mock()
+        mock_doc.exists = True
+        mock_doc.id = 'app'
+        mock_doc.to_dict.side_effect = lambda: {'theme': 'dark'}
+
+        mock_doc_ref = Mock()
+        mock_doc_ref.path = 'config/app'
+        mock_doc_ref.get = AsyncMock(return_value=mock_doc)
+        mock_doc_ref.update = AsyncMock()
+
+        with patch('firebase_admin_mcp.tools.firestore.get_async_db') as mock_get_db, \
+                patch('firebase_admin_mcp.tools.firestore.get_document_cache') as mock_get_cache:
+            mock_db = Mock()
+            mock_db.collection.return_value.document.return_value = mock_doc_ref
+            mock_get_db.return_value = mock_db
+            cache = DocumentCache(ttl=60, backend=backend)
+            cache.invalidate('config/app')
+            mock_get_cache.return_value = cache
+
+            await get_document('config', 'app')
+            result = await get_document('config', 'app')
+            assert result == {'theme': 'dark', '_id': 'app'}
+            assert mock_doc_ref.get.call_count == 1
+
+            await get_document('config', 'app', use_cache=False)
+            assert mock_doc_ref.get.call_count == 2
+
+            await update_document('config', 'app', {'theme': 'light'})
+            await get_document('config', 'app')
+            assert mock_doc_ref.get.call_count == 3
+    print("✓ get_document cache test passed")
+
+
+async def test_query_filter_validation():
+    """Test composite filters are built and unservable ones rejected."""
+    from ..tools.firestore import _apply_filters
+
+    mock_query = Mock()
+    _apply_filters(mock_query, {
+        'country': 'IN',
+        '$or': [{'status': 'active'}, {'role': {'in': ['admin', 'owner']}}]
+    })
+    composite = mock_query.where.call_args.kwargs['filter']
+    assert type(composite).__name__ == 'And'
+    assert type(composite.filters[1]).__name__ == 'Or'
+
+    rejected = [
+        {'role': {'in': list(range(31))}},
+        {'role': {'not-in': ['a']}, 'status': {'!=': 'b'}},
+        {'a': {'in': list(range(6))}, 'b': {'in': list(range(6))}},
+        {'role': {'like': 'admin'}},
+    ]
+    for filters in rejected:
+        mock_query = Mock()
+        try:
+            _apply_filters(mock_query, filters)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Filter should be rejected: {filters}")
+        assert not mock_query.where.called
+    print("✓ query filter validation test passed")
+
+
+async def test_query_paging():
+    """Test query pages over-fetch by one, and cursors resume after the last document."""
+    from django.test import override_settings
+    from ..tools.firestore import _encode_cursor, query_collection, query_collection_group
+
+    class FakeQuery:
+        """Ordered documents with the query methods _fetch_page uses."""
+
+        def __init__(self, docs, limits):
+            self.docs = docs
+            self.limits = limits
+            self.selected = None
+
+        def start_after(self, snapshot):
+            paths = [doc.reference.path for doc in self.docs]
+            return self._derive(self.docs[paths.index(snapshot.reference.path) + 1:])
+
+        def select(self, fields):
+            query = self._derive(self.docs)
+            query.selected = fields
+            return query
+
+        def limit(self, count):
+            self.limits.append(count)
+            return self._derive(self.docs[:count])
+
+        def _derive(self, docs):
+            query = FakeQuery(docs, self.limits)
+            query.selected = self.selected
+            return query
+
+        async def stream(self):
+            for doc in self.docs:
+                yield doc
+
+    def _doc(path):
+        doc = Mock()
+        doc.id = path.rsplit('/', 1)[-1]
+        doc.exists = True
+        doc.reference.path = path
+        doc.to_dict.side_effect = lambda: {'n': int(doc.id[1:])}
+        return doc
+
+    docs = [_doc(f'items/d{i}') for i in range(5)]
+    by_path = {doc.reference.path: doc for doc in docs}
+    limits = []
+
+    with patch('firebase_admin_mcp.tools.firestore.get_async_db') as mock_get_db, \
+            override_settings(MCP_QUERY_PAGE_SIZE=2, MCP_QUERY_MAX_PAGE_SIZE=3):
+        mock_db = Mock()
+        mock_db.collection.side_effect = lambda name: FakeQuery(docs, limits)
+        mock_db.collection_group.side_effect = lambda name: FakeQuery(docs, limits)
+        mock_db.document.side_effect = lambda path: Mock(
+            get=AsyncMock(return_value=by_path.get(path, Mock(exists=False))))
+        mock_get_db.return_value = mock_db
+
+        # Default page size, one extra document fetched to detect more pages
+        pages = []
+        cursor = None
+        while True:
+            page = await query_collection('items', cursor=cursor)
+            pages.append([doc['_id'] for doc in page['documents']])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert pages == [['d0', 'd1'], ['d2', 'd3'], ['d4']]
+        assert limits == [3, 3, 3]
+
+        # A page that ends exactly at the last document has no next page
+        page = await query_collection('items', page_size=3, cursor=_encode_cursor('items/d1'))
+        assert [doc['_id'] for doc in page['documents']] == ['d2', 'd3', 'd4']
+        assert page['next_cursor'] is None
+
+        # Requests past MCP_QUERY_MAX_PAGE_SIZE are capped, limit is an alias
+        limits.clear()
+        page = await query_collection('items', page_size=50)
+        assert len(page['documents']) == 3 and limits == [4]
+        page = await query_collection('items', limit=1)
+        assert [doc['_id'] for doc in page['documents']] == ['d0']
+        assert page['next_cursor'] == _encode_cursor('items/d0')
+
+        page = await query_collection_group('items', page_size=2)
+        assert page['documents'][1] == {'n': 1, '_id': 'd1', '_path': 'items/d1'}
+
+        for kwargs in ({'page_size': 0}, {'limit': -1}, {'cursor': 'not a cursor'},
+                       {'cursor': _encode_cursor('items/gone')}):
+            try:
+                await query_collection('items', **kwargs)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"query_collection should reject {kwargs}")
+
+    # Mirrored collections page from memory with the same cursors
+    with patch('firebase_admin_mcp.tools.firestore.get_mirror') as mock_get_mirror, \
+            override_settings(MCP_QUERY_MAX_PAGE_SIZE=3):
+        mirror = mock_get_mirror.return_value
+        mirror.query.return_value = ([{'_id': 'd2', 'n': 2}, {'_id': 'd3', 'n': 3}], True)
+        page = await query_collection(
+            'items', page_size=20, cursor=_encode_cursor('items/d1'), fields=['n'])
+        mirror.query.assert_called_once_with(None, 3, 'd1')
+        assert page == {'documents': [{'_id': 'd2', 'n': 2}, {'_id': 'd3', 'n': 3}],
+                        'next_cursor': _encode_cursor('items/d3')}
+    print("✓ query paging test passed")
+
+
+async def test_field_transforms():
+    """Test transform markers decode to sentinels and bad ones are rejected."""
+    from google.cloud.firestore import DELETE_FIELD, SERVER_TIMESTAMP, ArrayUnion, Increment
+    from ..tools.firestore import _decode_transforms, create_document, update_document
+
+    decoded = _decode_transforms({
+        'views': {'$increment': 1},
+        'tags': {'$arrayUnion': ['a']},
+        'stats': {'updated': {'$serverTimestamp': True}, 'old': {'$delete': True}},
+        'plain': {'a': 1, 'b': 2},
+    })
+    assert isinstance(decoded['views'], Increment)
+    assert isinstance(decoded['tags'], ArrayUnion)
+    assert decoded['stats'] == {'updated': SERVER_TIMESTAMP, 'old': DELETE_FIELD}
+    assert decoded['plain'] == {'a': 1, 'b': 2}
+
+    rejected = [
+        {'n': {'$increment': 'one'}},
+        {'n': {'$increment': True}},
+        {'tags': {'$arrayUnion': 'a'}},
+        {'tags': {'$arrayRemove': None}},
+        # Any other single-key "$" map is taken for a mistyped transform
+        {'meta': {'$ref': 'users/a'}},
+    ]
+    for data in rejected:
+        try:
+            _decode_transforms(data)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Transform should be rejected: {data}")
+
+    # create/update store "$" maps as plain data unless transforms is set
+    with patch('firebase_admin_mcp.tools.firestore.get_async_db') as mock_get_db:
+        doc_ref = mock_get_db.return_value.collection.return_value.document.return_value
+        doc_ref.path = 'users/a'
+        doc_ref.set = AsyncMock()
+        doc_ref.update = AsyncMock()
+        await create_document('users', {'_id': {'$oid': '5f1d'}})
+        doc_ref.set.assert_awaited_once_with({'_id': {'$oid': '5f1d'}})
+        await update_document('users', 'a', {'meta': {'$ref': 'users/b'}})
+        doc_ref.update.assert_awaited_once_with({'meta': {'$ref': 'users/b'}})
+
+        doc_ref.update.reset_mock()
+        await update_document('users', 'a', {'views': {'$increment': 1}}, transforms=True)
+        assert isinstance(doc_ref.update.await_args.args[0]['views'], Increment)
+        doc_ref.update.reset_mock()
+        try:
+            await update_document('users', 'a', {'meta': {'$ref': 'users/b'}}, transforms=True)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("update_document should reject unknown transforms")
+        assert not doc_ref.update.called
+    print("✓ field transforms test passed")
+
+
+async def test_transact():
+    """Test transact conditions and that a failed condition writes nothing."""
+    from ..tools.firestore import _check_condition, transact
+
+    def _snapshot(data, path='accounts/a'):
+        snap = Mock()
+        snap.exists = data is not None
+        snap.reference.path = path
+        snap.to_dict.side_effect = lambda: dict(data)
+        return snap
+
+    account = _snapshot({'balance': 10, 'tags': ['vip'], 'owner': {'name': 'A'}})
+    passing = [
+        {'exists': True},
+        {'field': 'balance', 'value': 10},
+        {'field': 'balance', 'op': '!=', 'value': 5},
+        {'field': 'balance', 'op': '<', 'value': 11},
+        {'field': 'balance', 'op': '<=', 'value': 10},
+        {'field': 'balance', 'op': '>', 'value': 9},
+        {'field': 'balance', 'op': '>=', 'value': 10},
+        {'field': 'balance', 'op': 'in', 'value': [10, 20]},
+        {'field': 'balance', 'op': 'not-in', 'value': [1, 2]},
+        {'field': 'tags', 'op': 'array-contains', 'value': 'vip'},
+        {'field': 'owner.name', 'value': 'A'},
+    ]
+    for condition in passing:
+        assert _check_condition(account, condition) is None, condition
+    failing = [
+        {'exists': False},
+        {'field': 'balance', 'op': '>', 'value': 10},
+        {'field': 'missing', 'value': 1},
+        {'field': 'tags', 'op': 'array-contains', 'value': 'new'},
+        # Incomparable types fail the condition instead of raising
+        {'field': 'balance', 'op': '<', 'value': 'ten'},
+    ]
+    for condition in failing:
+        assert _check_condition(account, condition), condition
+    assert _check_condition(_snapshot(None), {'field': 'balance', 'value': 1})
+    assert _check_condition(_snapshot(None), {'exists': False}) is None
+    try:
+        _check_condition(account, {'field': 'balance', 'op': 'like', 'value': 1})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown condition operators should be rejected")
+
+    def _document(doc_id):
+        ref = Mock()
+        ref.id = doc_id
+        ref.path = f'accounts/{doc_id}'
+        return ref
+
+    async def _get_all(refs, transaction=None):
+        yield _snapshot({'balance': 5})
+
+    operations = [
+        {'op': 'update', 'collection': 'accounts', 'doc_id': 'a', 'data': {'balance': {'$increment': -10}}},
+        {'op': 'update', 'collection': 'accounts', 'doc_id': 'b', 'data': {'balance': {'$increment': 10}}},
+    ]
+    with patch('firebase_admin_mcp.tools.firestore.get_async_db') as mock_get_db, \
+            patch('firebase_admin_mcp.tools.firestore.async_transactional', lambda func: func):
+        mock_db = Mock()
+        mock_db.collection.return_value.document.side_effect = _document
+        mock_db.get_all = Mock(side_effect=_get_all)
+        mock_get_db.return_value = mock_db
+        transaction = mock_db.transaction.return_value
+
+        result = await transact(operations, [
+            {'collection': 'accounts', 'doc_id': 'a', 'field': 'balance', 'op': '>=', 'value': 10}])
+        assert result['committed'] is False
+        assert result['failed_condition'] == 0
+        assert not transaction.update.called
+
+        result = await transact(operations, [
+            {'collection': 'accounts', 'doc_id': 'a', 'field': 'balance', 'op': '>=', 'value': 5}])
+        assert result['committed'] is True
+        assert [r['doc_id'] for r in result['results']] == ['a', 'b']
+        assert transaction.update.call_count == 2
+        mock_db.transaction.assert_called_with(max_attempts=5)
+    print("✓ transact test passed")
+
+
+async def test_service_executor():
+    """Test service pools run calls in the caller's context and track stats."""
+    import contextvars
+    from ..firebase_init import ServiceExecutor
+
+    request_id = contextvars.ContextVar('request_id')
+    request_id.set('abc')
+    executor = ServiceExecutor('test', max_workers=2)
+
+    results = await asyncio.gather(*(executor.run(request_id.get) for _ in range(5)))
+    assert results == ['abc'] * 5
+
+    stats = executor.stats()
+    assert stats['max_workers'] == 2
+    assert stats['completed'] == 5
+    assert stats['queued'] == 0 and stats['running'] == 0
+    print("✓ service executor test passed")
+
+
 def run_tests():
     """Run all tests."""
     try:
         asyncio.run(test_get_document())
         asyncio.run(test_get_document_not_found())
+        asyncio.run(test_get_documents())
+        asyncio.run(test_batch_write_bulk())
+        asyncio.run(test_export_tree())
+        asyncio.run(test_delete_collection())
+        asyncio.run(test_local_paths())
+        asyncio.run(test_download_range())
+        asyncio.run(test_get_document_cache())
+        asyncio.run(test_query_filter_validation())
+        asyncio.run(test_query_paging())
+        asyncio.run(test_field_transforms())
+        asyncio.run(test_transact())
+        asyncio.run(test_service_executor())
         print("All tests passed!")
         return True
     except Exception as e:
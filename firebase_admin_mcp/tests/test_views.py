@@ -0,0 +1,245 @@
+"""
+Tests for the MCP HTTP endpoint, driven with stub tools.
+"""
+import asyncio
+import json
+from unittest.mock import patch
+
+
+def _post(payload, headers=None):
+    """Build a JSON-RPC POST request to the MCP endpoint."""
+    from django.test import AsyncRequestFactory
+    return AsyncRequestFactory().post(
+        '/mcp/', data=json.dumps(payload), content_type='application/json', headers=headers)
+
+
+def _call(name, arguments=None, request_id=None, meta=None):
+    """Build a tools/call message."""
+    params = {'name': name, 'arguments': arguments or {}}
+    if meta is not None:
+        params['_meta'] = meta
+    message = {'jsonrpc': '2.0', 'method': 'tools/call', 'params': params}
+    if request_id is not None:
+        message['id'] = request_id
+    return message
+
+
+async def _echo(**kwargs):
+    return kwargs
+
+
+async def _slow_echo(delay=0.05, **kwargs):
+    await asyncio.sleep(delay)
+    return kwargs
+
+
+async def _fail():
+    raise RuntimeError('tool failed')
+
+
+STUB_TOOLS = {'echo': _echo, 'slow_echo': _slow_echo, 'fail': _fail}
+
+
+async def _read_events(response):
+    """Collect a streamed SSE response into its decoded data payloads."""
+    body = b''.join([chunk async for chunk in response.streaming_content])
+    events = []
+    for event in body.split(b'\n\n'):
+        if not event:
+            continue
+        name, data = event.split(b'\n', 1)
+        assert name == b'event: message'
+        assert data.startswith(b'data: ')
+        events.append(json.loads(data[len(b'data: '):]))
+    return events
+
+
+async def test_batch():
+    """Test batches answer in request order and isolate failing entries."""
+    from .. import views
+
+    original = views._handle_message
+
+    async def _handle_message(message, stream=False):
+        if isinstance(message, dict) and message.get('method') == 'boom':
+            raise RuntimeError('dispatch failed')
+        return await original(message, stream)
+
+    with patch.dict(views.TOOLS, STUB_TOOLS), \
+            patch('firebase_admin_mcp.views._handle_message', _handle_message):
+        response = await views.mcp_handler(_post([
+            _call('slow_echo', {'value': 1}, request_id=1),
+            _call('echo', {'value': 'notified'}),
+            _call('fail', request_id=2),
+            {'jsonrpc': '1.0', 'method': 'tools/list', 'id': 3},
+            {'jsonrpc': '2.0', 'method': 'tools/call', 'params': [], 'id': 4},
+            _call('missing', request_id=5),
+            {'jsonrpc': '2.0', 'method': 'boom', 'id': 6},
+            _call('echo', {'value': 7}, request_id=7, meta={'resultFormat': 'structured'}),
+        ]))
+        assert response.status_code == 200
+        responses = json.loads(response.content)
+        # The slow first entry still comes first; the notification is dropped
+        assert [item['id'] for item in responses] == [1, 2, 3, 4, 5, 6, 7]
+        assert json.loads(responses[0]['result']['content'][0]['text']) == {'value': 1}
+        assert [item.get('error', {}).get('code') for item in responses[1:6]] == [
+            -32000, -32600, -32602, -32601, -32000]
+        assert responses[5]['error']['message'] == 'Internal server error: dispatch failed'
+        assert responses[6]['result'] == {'content': [], 'structuredContent': {'value': 7}}
+
+        # A batch of notifications only gets an empty 204
+        response = await views.mcp_handler(_post([
+            {'jsonrpc': '2.0', 'method': 'notifications/initialized'},
+            _call('echo'),
+        ]))
+        assert response.status_code == 204
+        assert response.content == b''
+
+        for payload in ([], [_call('echo', request_id=i) for i in range(3)]):
+            with patch('django.conf.settings.MCP_MAX_BATCH_SIZE', 2):
+                response = await views.mcp_handler(_post(payload))
+            assert response.status_code == 400
+            assert json.loads(response.content)['error']['code'] == -32600
+    print("✓ batch test passed")
+
+
+async def test_result_format():
+    """Test resultFormat selects the tools/call content and is validated."""
+    from .. import views
+
+    with patch.dict(views.TOOLS, STUB_TOOLS):
+        expected = {
+            'text': {'content': [{'type': 'text', 'text': '{"a":[1,2]}'}]},
+            'both': {'content': [{'type': 'text', 'text': '{"a":[1,2]}'}],
+                     'structuredContent': {'a': [1, 2]}},
+            'structured': {'content': [], 'structuredContent': {'a': [1, 2]}},
+        }
+        for result_format, result in expected.items():
+            response = await views.mcp_handler(_post(
+                _call('echo', {'a': [1, 2]}, request_id=1, meta={'resultFormat': result_format})))
+            assert response.status_code == 200
+            result['content'] = [
+                dict(item, text=json.dumps(json.loads(item['text']))) for item in result['content']]
+            content = json.loads(response.content)['result']
+            content['content'] = [
+                dict(item, text=json.dumps(json.loads(item['text']))) for item in content['content']]
+            assert content == result, (result_format, content)
+
+        # Non-object results are wrapped for structuredContent
+        response = await views.mcp_handler(_post(
+            _call('echo', request_id=1, meta={'resultFormat': 'structured'})))
+        assert json.loads(response.content)['result']['structuredContent'] == {}
+
+        for meta in ({'resultFormat': 'xml'}, {'resultFormat': None}):
+            response = await views.mcp_handler(_post(_call('echo', request_id=1, meta=meta)))
+            assert response.status_code == 400
+            assert json.loads(response.content)['error']['code'] == -32602
+    print("✓ result format test passed")
+
+
+async def test_sse():
+    """Test streamed responses are framed as SSE events, including batches."""
+    from .. import views
+    from ..progress import progress_callback
+
+    async def _report(**kwargs):
+        report = progress_callback()
+        report(1, 2, 'half way')
+        return {'text': 'quote " backslash \\ newline \n', 'items': list(range(50))}
+
+    with patch.dict(views.TOOLS, dict(STUB_TOOLS, report=_report)), \
+            patch('firebase_admin_mcp.views.SSE_CHUNK_SIZE', 16):
+        response = await views.mcp_handler(_post(
+            _call('report', request_id='r1', meta={'progressToken': 'p1', 'resultFormat': 'both'}),
+            headers={'Accept': 'application/json, text/event-stream'}))
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/event-stream'
+        assert response['Cache-Control'] == 'no-cache'
+        progress, result = await _read_events(response)
+        assert progress == {
+            'jsonrpc': '2.0',
+            'method': 'notifications/progress',
+            'params': {'progressToken': 'p1', 'progress': 1, 'total': 2, 'message': 'half way'}
+        }
+        assert result['id'] == 'r1'
+        expected = {'text': 'quote " backslash \\ newline \n', 'items': list(range(50))}
+        # Text content is escaped chunk by chunk, but decodes to the same JSON
+        assert json.loads(result['result']['content'][0]['text']) == expected
+        assert result['result']['structuredContent'] == expected
+
+        # Batches stream one event per request, errors included
+        response = await views.mcp_handler(_post([
+            _call('slow_echo', {'value': 1}, request_id=1),
+            _call('fail', request_id=2),
+            _call('echo'),
+        ], headers={'Accept': 'text/event-stream'}))
+        events = await _read_events(response)
+        assert sorted(event['id'] for event in events) == [1, 2]
+        errors = [event for event in events if 'error' in event]
+        assert [event['id'] for event in errors] == [2]
+
+        # Notifications alone are not streamed
+        response = await views.mcp_handler(_post(
+            {'jsonrpc': '2.0', 'method': 'notifications/initialized'},
+            headers={'Accept': 'text/event-stream'}))
+        assert response.status_code == 204
+    print("✓ SSE test passed")
+
+
+async def test_caching():
+    """Test GET server info revalidates with its ETag and tools/list isn't cached."""
+    from django.test import AsyncRequestFactory
+    from .. import views
+
+    factory = AsyncRequestFactory()
+    response = await views.mcp_handler(factory.get('/mcp/'))
+    assert response.status_code == 200
+    etag = response['ETag']
+    assert etag == views.SERVER_INFO_ETAG and not etag.startswith('W/')
+    assert response['Cache-Control'].startswith('public, max-age=')
+    assert json.loads(response.content)['name'] == 'Firebase MCP Server'
+
+    for if_none_match in (etag, f'"other", {etag}', '*'):
+        response = await views.mcp_handler(factory.get('/mcp/', headers={'If-None-Match': if_none_match}))
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response['ETag'] == etag
+    response = await views.mcp_handler(factory.get('/mcp/', headers={'If-None-Match': '"other"'}))
+    assert response.status_code == 200
+
+    # The POST body echoes the request id, so its ETag is weak and not cacheable
+    for request_id in (1, 'two'):
+        response = await views.mcp_handler(_post(
+            {'jsonrpc': '2.0', 'method': 'tools/list', 'id': request_id}))
+        assert response.status_code == 200
+        assert response['ETag'] == 'W/' + views.TOOLS_LIST_ETAG
+        assert response['Cache-Control'] == 'private, no-store'
+        body = json.loads(response.content)
+        assert body['id'] == request_id
+        assert body['result'] == json.loads(json.dumps(views.TOOLS_LIST_RESULT))
+
+    # SSE is not offered on GET
+    response = await views.mcp_handler(factory.get('/mcp/', headers={'Accept': 'text/event-stream'}))
+    assert response.status_code == 405
+    print("✓ caching test passed")
+
+
+def run_tests():
+    """Run all tests."""
+    try:
+        asyncio.run(test_batch())
+        asyncio.run(test_result_format())
+        asyncio.run(test_sse())
+        asyncio.run(test_caching())
+        print("All tests passed!")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    print("Running MCP HTTP endpoint tests...")
+    run_tests()
@@ -1,10 +1,9 @@
 """
 Firebase Authentication tools for MCP server.
 """
-import asyncio
 from typing import Dict, Optional
 from firebase_admin import auth
-from ..firebase_init import get_auth
+from ..firebase_init import get_auth, run_in_executor
 
 
 async def verify_id_token(token: str) -> dict:
@@ -21,7 +20,7 @@ async def verify_id_token(token: str) -> dict:
         auth_client = get_auth()
         return auth_client.verify_id_token(token)
 
-    decoded_token = await asyncio.to_thread(_verify)
+    decoded_token = await run_in_executor('auth', _verify)
     return dict(decoded_token)
 
 
@@ -40,7 +39,7 @@ async def create_custom_token(uid: str, claims: Optional[dict] = None) -> str:
         auth_client = get_auth()
         return auth_client.create_custom_token(uid, claims)
 
-    token = await asyncio.to_thread(_create)
+    token = await run_in_executor('auth', _create)
     return token.decode('utf-8')
 
 
@@ -77,7 +76,7 @@ async def get_user(uid: str) -> dict:
             ]
         }
 
-    return await asyncio.to_thread(_get)
+    return await run_in_executor('auth', _get)
 
 
 async def delete_user(uid: str) -> bool:
@@ -95,4 +94,4 @@ async def delete_user(uid: str) -> bool:
         auth_client.delete_user(uid)
         return True
 
-    return await asyncio.to_thread(_delete)
+    return await run_in_executor('auth', _delete)
@@ -1,57 +1,229 @@
 """
 Firestore database tools for MCP server.
 """
-import asyncio
+import base64
+import json
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
-from google.cloud.firestore import Query
-from ..firebase_init import get_db
+from django.conf import settings
+from google.cloud.firestore import (
+    DELETE_FIELD, SERVER_TIMESTAMP, And, ArrayRemove, ArrayUnion, CollectionReference,
+    FieldFilter, Increment, Or, Query, async_transactional
+)
+from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions
+from .. import encoding
+from ..cache import get_document_cache
+from ..firebase_init import get_async_db, get_db, run_in_executor
+from ..local_files import resolve_local_path
+from ..mirror import get_mirror, note_writes
+from ..progress import progress_callback
 
+# Firestore limit on writes in a single commit
+MAX_BATCH_WRITES = 500
 
-async def get_document(collection: str, doc_id: str) -> dict:
+# gRPC status codes worth retrying for bulk writes (throttling/contention)
+RETRYABLE_WRITE_CODES = {
+    4,   # DEADLINE_EXCEEDED
+    8,   # RESOURCE_EXHAUSTED
+    10,  # ABORTED
+    14,  # UNAVAILABLE
+}
+
+WRITE_OPS = ('create', 'set', 'update', 'delete')
+
+# Field values like {"$increment": 1} that decode to atomic server-side transforms
+FIELD_TRANSFORMS = {
+    '$increment': Increment,
+    '$arrayUnion': ArrayUnion,
+    '$arrayRemove': ArrayRemove,
+    '$serverTimestamp': lambda _: SERVER_TIMESTAMP,
+    '$delete': lambda _: DELETE_FIELD,
+}
+
+# Report bulk progress every this many completed operations
+PROGRESS_INTERVAL = 500
+
+FILTER_OPS = ('==', '!=', '<', '<=', '>', '>=', 'in', 'not-in',
+              'array-contains', 'array-contains-any')
+
+# Firestore limits on filter values and query shape
+MAX_IN_VALUES = 30       # in, array-contains-any
+MAX_NOT_IN_VALUES = 10
+MAX_DISJUNCTIONS = 30    # terms after expanding to disjunctive normal form
+
+# Documents fetched per get_all call when exporting a tree
+EXPORT_BATCH_SIZE = 100
+
+# Deleted document paths dropped from the document cache per call, so a
+# large delete_collection makes one cache round trip per chunk, not per document
+INVALIDATE_BATCH_SIZE = 1000
+
+
+def _record_writes(*paths: str):
+    """Invalidate cached and mirrored copies of documents written here."""
+    get_document_cache().invalidate(*paths)
+    note_writes(*paths)
+
+
+async def _arecord_writes(*paths: str):
+    """_record_writes() for async callers, without blocking on the cache backend."""
+    await get_document_cache().ainvalidate(*paths)
+    note_writes(*paths)
+
+
+def _project(data: dict, fields: List[str]) -> dict:
+    """
+    Keep only the given (dotted) field paths of a document, the way a
+    Firestore projection returns them. '_id' is always kept.
+    """
+    projected = {}
+    for field in fields:
+        value = data
+        parts = field.split('.')
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    if '_id' in data:
+        projected['_id'] = data['_id']
+    return projected
+
+
+async def get_document(
+    collection: str,
+    doc_id: str,
+    use_cache: bool = True,
+    fields: Optional[List[str]] = None
+) -> dict:
     """
     Get a document from Firestore.
 
+    Mirrored collections (settings.MCP_MIRROR_COLLECTIONS) are served from
+    memory; other reads go through the document cache when it is enabled for
+    the collection (settings.MCP_DOCUMENT_CACHE).
+
     Args:
         collection: The collection name
         doc_id: The document ID
+        use_cache: Set to False to bypass the mirror and cache and read
+            from Firestore
+        fields: Field paths to return (e.g. ["name", "address.city"]);
+            other fields are left out of the read
 
     Returns:
         dict: Document data or empty dict if not found
     """
-    def _get():
-        db = get_db()
-        doc_ref = db.collection(collection).document(doc_id)
-        doc = doc_ref.get()
+    if use_cache:
+        mirror = get_mirror(collection)
+        data = mirror.get(doc_id) if mirror is not None else None
+        if data is not None:
+            return _project(data, fields) if fields and data else data
+
+    cache = get_document_cache()
+    ttl = cache.ttl_for(collection) if use_cache else 0
+    path = f'{collection}/{doc_id}'
+    if ttl:
+        data = await cache.aget(path)
+        if data is not None:
+            return _project(data, fields) if fields and data else data
+        if fields:
+            # Only full documents are cached
+            ttl = 0
+        else:
+            generation = cache.generation()
+
+    db = get_async_db()
+    doc_ref = db.collection(collection).document(doc_id)
+    # Field mask: only the requested fields are transferred
+    doc = await doc_ref.get(field_paths=fields or None)
+    if doc.exists:
+        data = doc.to_dict()
+        data['_id'] = doc.id
+    else:
+        data = {}
+
+    if ttl:
+        await cache.aset(path, dict(data), ttl, generation)
+    return data
+
+
+async def get_documents(documents: List[dict], fields: Optional[List[str]] = None) -> List[dict]:
+    """
+    Get several documents from Firestore in a single batched read.
+
+    Args:
+        documents: List of {"collection": ..., "doc_id": ...} references
+        fields: Field paths to return for every document (optional)
+
+    Returns:
+        List[dict]: Document data in input order. Missing documents are
+            returned as {"_id": doc_id, "_collection": collection, "_missing": True}
+    """
+    if not documents:
+        return []
+
+    db = get_async_db()
+    refs = [
+        db.collection(item['collection']).document(item['doc_id'])
+        for item in documents
+    ]
+
+    # get_all does not preserve order, so index snapshots by path
+    snapshots = {}
+    async for doc in db.get_all(refs, field_paths=fields or None):
         if doc.exists:
             data = doc.to_dict()
             data['_id'] = doc.id
-            return data
-        return {}
+            snapshots[doc.reference.path] = data
 
-    return await asyncio.to_thread(_get)
+    results = []
+    for item, ref in zip(documents, refs):
+        data = snapshots.get(ref.path)
+        if data is None:
+            data = {
+                '_id': item['doc_id'],
+                '_collection': item['collection'],
+                '_missing': True
+            }
+        else:
+            # Copy so duplicate references don't share one dict
+            data = dict(data)
+        results.append(data)
+    return results
 
 
-async def create_document(collection: str, data: dict) -> str:
+async def create_document(collection: str, data: dict, transforms: bool = False) -> str:
     """
     Create a new document in Firestore.
 
     Args:
         collection: The collection name
         data: The document data
+        transforms: Decode field transforms in data (see _decode_transforms);
+            off by default, so "$" keys are stored as plain data
 
     Returns:
         str: The created document ID
     """
-    def _create():
-        db = get_db()
-        doc_ref = db.collection(collection).document()
-        doc_ref.set(data)
-        return doc_ref.id
-
-    return await asyncio.to_thread(_create)
+    db = get_async_db()
+    doc_ref = db.collection(collection).document()
+    if transforms:
+        data = _decode_transforms(data)
+    try:
+        await doc_ref.set(data)
+    finally:
+        await _arecord_writes(doc_ref.path)
+    return doc_ref.id
 
 
-async def update_document(collection: str, doc_id: str, data: dict) -> bool:
+async def update_document(collection: str, doc_id: str, data: dict, transforms: bool = False) -> bool:
     """
     Update an existing document in Firestore.
 
@@ -59,17 +231,22 @@ async def update_document(collection: str, doc_id: str, data: dict) -> bool:
         collection: The collection name
         doc_id: The document ID
         data: The updated data
+        transforms: Decode field transforms such as {"$increment": 1} in
+            data, applied atomically on the server (see _decode_transforms);
+            off by default, so "$" keys are stored as plain data
 
     Returns:
         bool: True if successful
     """
-    def _update():
-        db = get_db()
-        doc_ref = db.collection(collection).document(doc_id)
-        doc_ref.update(data)
-        return True
-
-    return await asyncio.to_thread(_update)
+    db = get_async_db()
+    doc_ref = db.collection(collection).document(doc_id)
+    if transforms:
+        data = _decode_transforms(data)
+    try:
+        await doc_ref.update(data)
+    finally:
+        await _arecord_writes(doc_ref.path)
+    return True
 
 
 async def delete_document(collection: str, doc_id: str) -> bool:
@@ -83,13 +260,446 @@ async def delete_document(collection: str, doc_id: str) -> bool:
     Returns:
         bool: True if successful
     """
+    db = get_async_db()
+    doc_ref = db.collection(collection).document(doc_id)
+    try:
+        await doc_ref.delete()
+    finally:
+        await _arecord_writes(doc_ref.path)
+    return True
+
+
+def _decode_transforms(data: dict) -> dict:
+    """
+    Replace transform markers in write data with Firestore sentinels.
+
+    A field value that is a single-key dict naming a transform is applied
+    on the server as part of the write, without a read:
+    {"$increment": n}, {"$arrayUnion": [...]}, {"$arrayRemove": [...]},
+    {"$serverTimestamp": true} and {"$delete": true}. Nested maps are
+    decoded too.
+    """
+    decoded = {}
+    for field, value in data.items():
+        if isinstance(value, dict) and len(value) == 1 and next(iter(value)).startswith('$'):
+            name, operand = next(iter(value.items()))
+            if name not in FIELD_TRANSFORMS:
+                raise ValueError(
+                    f"Unknown field transform {name!r} on {field!r} (expected one of {', '.join(FIELD_TRANSFORMS)})")
+            if name in ('$arrayUnion', '$arrayRemove') and not isinstance(operand, list):
+                raise ValueError(f"'{name}' on {field!r} needs a list")
+            if name == '$increment' and (isinstance(operand, bool) or not isinstance(operand, (int, float))):
+                raise ValueError(f"'$increment' on {field!r} needs a number")
+            value = FIELD_TRANSFORMS[name](operand)
+        elif isinstance(value, dict):
+            value = _decode_transforms(value)
+        decoded[field] = value
+    return decoded
+
+
+def _resolve_write(db, operation: dict):
+    """Validate a batch_write operation and return its (op, ref, data)."""
+    op = operation.get('op')
+    if op not in WRITE_OPS:
+        raise ValueError(
+            f"Unsupported write op: {op!r} (expected one of {', '.join(WRITE_OPS)})")
+
+    collection = db.collection(operation['collection'])
+    doc_id = operation.get('doc_id')
+    if doc_id:
+        doc_ref = collection.document(doc_id)
+    elif op in ('create', 'set'):
+        # Auto-generate an ID like create_document does
+        doc_ref = collection.document()
+    else:
+        raise ValueError(f"'{op}' operations require a doc_id")
+
+    data = operation.get('data')
+    if op != 'delete':
+        if not isinstance(data, dict):
+            raise ValueError(f"'{op}' operations require a data object")
+        data = _decode_transforms(data)
+    return op, doc_ref, data
+
+
+async def batch_write(
+    operations: List[dict],
+    atomic: Optional[bool] = None,
+    max_retries: int = 5
+) -> dict:
+    """
+    Apply a list of mixed create/set/update/delete operations.
+
+    Up to 500 operations are committed atomically in a single WriteBatch.
+    Larger lists (or atomic=False) are streamed through a BulkWriter, which
+    parallelizes commits and retries throttled writes with backoff.
+
+    Args:
+        operations: List of {"op": "create"|"set"|"update"|"delete",
+            "collection": ..., "doc_id": ..., "data": {...}, "merge": bool}.
+            data may use field transforms (see _decode_transforms).
+        atomic: Force (True) or disable (False) the single atomic commit.
+            Defaults to atomic when the list fits in one batch.
+        max_retries: Retry attempts per throttled write in bulk mode
+
+    Returns:
+        dict: {"mode", "written", "failed", "results"} where results holds a
+            per-operation {"index", "doc_id", "status"} entry in input order
+    """
+    if atomic is None:
+        atomic = len(operations) <= MAX_BATCH_WRITES
+    if atomic and len(operations) > MAX_BATCH_WRITES:
+        raise ValueError(
+            f"Atomic batches are limited to {MAX_BATCH_WRITES} operations, got {len(operations)}")
+
+    async def _commit_batch():
+        db = get_async_db()
+        batch = db.batch()
+        results = []
+        refs = []
+        for index, operation in enumerate(operations):
+            op, doc_ref, data = _resolve_write(db, operation)
+            refs.append(doc_ref)
+            if op == 'create':
+                batch.create(doc_ref, data)
+            elif op == 'set':
+                batch.set(doc_ref, data, merge=operation.get('merge', False))
+            elif op == 'update':
+                batch.update(doc_ref, data)
+            else:
+                batch.delete(doc_ref)
+            results.append(
+                {'index': index, 'doc_id': doc_ref.id, 'status': 'ok'})
+
+        if results:
+            try:
+                await batch.commit()
+            finally:
+                await _arecord_writes(
+                    *(doc_ref.path for doc_ref in refs))
+        return {
+            'mode': 'batch',
+            'written': len(results),
+            'failed': 0,
+            'results': results
+        }
+
+    def _bulk_write():
+        db = get_db()
+        resolved = [_resolve_write(db, operation) for operation in operations]
+
+        results = [None] * len(resolved)
+        # The writer reports by document reference, so track which operation
+        # indexes are still outstanding for each document path
+        pending = defaultdict(deque)
+        for index, (_, doc_ref, _) in enumerate(resolved):
+            pending[doc_ref.path].append(index)
+        lock = threading.Lock()
+        completed = [0]
+        # Callbacks run on the writer's threads, so bind progress up front
+        report = progress_callback()
+
+        def _complete(index, result):
+            with lock:
+                results[index] = result
+                completed[0] += 1
+                done = completed[0]
+            if done % PROGRESS_INTERVAL == 0 or done == len(results):
+                report(done, len(results))
+
+        def _on_result(reference, result, bulk_writer):
+            with lock:
+                index = pending[reference.path].popleft()
+            _complete(index, {
+                'index': index, 'doc_id': reference.id, 'status': 'ok'})
+
+        def _on_error(failure, bulk_writer):
+            if failure.code in RETRYABLE_WRITE_CODES and failure.attempts < max_retries:
+                return True
+            reference = failure.operation.reference
+            with lock:
+                index = pending[reference.path].popleft()
+            _complete(index, {
+                'index': index,
+                'doc_id': reference.id,
+                'status': 'error',
+                'code': failure.code,
+                'message': failure.message
+            })
+            return False
+
+        bulk_writer = db.bulk_writer(
+            options=BulkWriterOptions(retry=BulkRetry.exponential))
+        bulk_writer.on_write_result(_on_result)
+        bulk_writer.on_write_error(_on_error)
+
+        for (op, doc_ref, data), operation in zip(resolved, operations):
+            if op == 'create':
+                bulk_writer.create(doc_ref, data)
+            elif op == 'set':
+                bulk_writer.set(doc_ref, data, merge=operation.get('merge', False))
+            elif op == 'update':
+                bulk_writer.update(doc_ref, data)
+            else:
+                bulk_writer.delete(doc_ref)
+        try:
+            bulk_writer.close()
+        finally:
+            _record_writes(
+                *(doc_ref.path for _, doc_ref, _ in resolved))
+
+        # A batch whose commit RPC itself fails reports through neither
+        # callback, so its operations are still unaccounted for here
+        for index, ((_, doc_ref, _), result) in enumerate(zip(resolved, results)):
+            if result is None:
+                results[index] = {
+                    'index': index,
+                    'doc_id': doc_ref.id,
+                    'status': 'error',
+                    'message': 'Write was not confirmed: its batch failed to commit'
+                }
+
+        failed = sum(1 for result in results if result['status'] != 'ok')
+        return {
+            'mode': 'bulk',
+            'written': len(results) - failed,
+            'failed': failed,
+            'results': results
+        }
+
+    if atomic:
+        return await _commit_batch()
+    # BulkWriter only exists for the sync client
+    return await run_in_executor('firestore', _bulk_write)
+
+
+def _parse_path(db, path: str):
+    """Resolve a slash-separated path to a collection or document reference."""
+    segments = [segment for segment in path.split('/') if segment]
+    if not segments:
+        raise ValueError("A collection or document path is required")
+    if len(segments) % 2:
+        return db.collection(*segments)
+    return db.document(*segments)
+
+
+async def delete_collection(
+    path: str,
+    dry_run: bool = False,
+    chunk_size: int = 5000,
+    max_ops_per_second: int = 500,
+    max_retries: int = 5
+) -> dict:
+    """
+    Recursively delete a collection, or a document and its subcollections.
+
+    Deletes go through a BulkWriter, which sends them in parallel and ramps
+    throughput up to max_ops_per_second.
+
+    Args:
+        path: Collection path (e.g. "test_users") or document path
+            (e.g. "users/abc") to delete with everything below it
+        dry_run: Only count the documents that would be deleted
+        chunk_size: Document references fetched per query page
+        max_ops_per_second: Throughput ceiling for the deletes
+        max_retries: Retry attempts per throttled delete
+
+    Returns:
+        dict: {"path", "dry_run", "documents"} for a dry run, otherwise
+            {"path", "dry_run", "deleted", "failed"}
+    """
+    def _count(reference):
+        if isinstance(reference, CollectionReference):
+            # Aggregation over all descendants: one RPC, no documents read
+            return reference.recursive().count().get()[0][0].value
+        return 1 + sum(_count(col) for col in reference.collections())
+
     def _delete():
         db = get_db()
-        doc_ref = db.collection(collection).document(doc_id)
-        doc_ref.delete()
-        return True
+        reference = _parse_path(db, path)
+        if dry_run:
+            return {'path': path, 'dry_run': True, 'documents': _count(reference)}
+
+        lock = threading.Lock()
+        counts = {'deleted': 0, 'failed': 0}
+        deleted_paths = []
+        # Callbacks run on the writer's threads, so bind progress up front
+        report = progress_callback()
+        cache = get_document_cache()
+
+        def _on_result(reference, result, bulk_writer):
+            # Mirrors are in memory; cache invalidation is batched below
+            note_writes(reference.path)
+            chunk = None
+            with lock:
+                counts['deleted'] += 1
+                done = counts['deleted'] + counts['failed']
+                deleted_paths.append(reference.path)
+                if len(deleted_paths) >= INVALIDATE_BATCH_SIZE:
+                    chunk = deleted_paths[:]
+                    deleted_paths.clear()
+            if chunk:
+                cache.invalidate(*chunk)
+            if done % PROGRESS_INTERVAL == 0:
+                report(done, message=f"Deleted {counts['deleted']} documents")
+
+        def _on_error(failure, bulk_writer):
+            if failure.code in RETRYABLE_WRITE_CODES and failure.attempts < max_retries:
+                return True
+            with lock:
+                counts['failed'] += 1
+            return False
+
+        bulk_writer = db.bulk_writer(options=BulkWriterOptions(
+            initial_ops_per_second=min(500, max_ops_per_second),
+            max_ops_per_second=max_ops_per_second,
+            retry=BulkRetry.exponential
+        ))
+        bulk_writer.on_write_result(_on_result)
+        bulk_writer.on_write_error(_on_error)
 
-    return await asyncio.to_thread(_delete)
+        try:
+            enqueued = db.recursive_delete(reference, bulk_writer=bulk_writer, chunk_size=chunk_size)
+        finally:
+            with lock:
+                chunk = deleted_paths[:]
+                deleted_paths.clear()
+            if chunk:
+                cache.invalidate(*chunk)
+        # Deletes in a batch whose commit RPC failed reach neither callback
+        counts['failed'] += max(0, enqueued - counts['deleted'] - counts['failed'])
+        report(counts['deleted'] + counts['failed'], counts['deleted'] + counts['failed'])
+        return {
+            'path': path,
+            'dry_run': False,
+            'deleted': counts['deleted'],
+            'failed': counts['failed']
+        }
+
+    # recursive_delete drives a BulkWriter, which only the sync client has
+    return await run_in_executor('firestore', _delete)
+
+
+def _field_value(data: dict, field: str):
+    """Look up a dotted field path, raising KeyError if it is missing."""
+    value = data
+    for part in field.split('.'):
+        if not isinstance(value, dict):
+            raise KeyError(field)
+        value = value[part]
+    return value
+
+
+def _check_condition(snapshot, condition: dict) -> Optional[str]:
+    """Check a transact condition against a snapshot; return why it fails."""
+    if 'exists' in condition and snapshot.exists != condition['exists']:
+        return 'document exists' if snapshot.exists else 'document does not exist'
+    if 'field' not in condition:
+        return None
+    if not snapshot.exists:
+        return 'document does not exist'
+
+    field = condition['field']
+    op = condition.get('op', '==')
+    expected = condition.get('value')
+    try:
+        value = _field_value(snapshot.to_dict(), field)
+    except KeyError:
+        return f"field {field!r} is missing"
+
+    try:
+        if op == '==':
+            ok = value == expected
+        elif op == '!=':
+            ok = value != expected
+        elif op == '<':
+            ok = value < expected
+        elif op == '<=':
+            ok = value <= expected
+        elif op == '>':
+            ok = value > expected
+        elif op == '>=':
+            ok = value >= expected
+        elif op == 'in':
+            ok = value in expected
+        elif op == 'not-in':
+            ok = value not in expected
+        elif op == 'array-contains':
+            ok = isinstance(value, list) and expected in value
+        else:
+            raise ValueError(f"Unsupported condition operator {op!r} on {field!r}")
+    except TypeError:
+        ok = False
+    return None if ok else f"{field} {op} {expected!r} is false (value: {value!r})"
+
+
+async def transact(
+    operations: List[dict],
+    conditions: Optional[List[dict]] = None,
+    max_attempts: int = 5
+) -> dict:
+    """
+    Check conditions and apply writes atomically in one Firestore transaction.
+
+    The condition documents are read inside the transaction. If any
+    condition fails, nothing is written. If a condition document changes
+    before the commit, the transaction is retried up to max_attempts times.
+    Writes can use field transforms (e.g. {"$increment": 1}), so counters
+    and arrays can be updated without a separate read.
+
+    Args:
+        operations: Writes, as for batch_write
+        conditions: List of {"collection", "doc_id"} checks, each with
+            "exists": bool and/or "field", "op" (==, !=, <, <=, >, >=, in,
+            not-in, array-contains; default ==) and "value"
+        max_attempts: Attempts before giving up on contention
+
+    Returns:
+        dict: {"committed": true, "results": [...]} or
+            {"committed": false, "failed_condition": index, "reason": ...}
+    """
+    conditions = conditions or []
+    if len(operations) > MAX_BATCH_WRITES:
+        raise ValueError(
+            f"Transactions are limited to {MAX_BATCH_WRITES} writes, got {len(operations)}")
+
+    db = get_async_db()
+    resolved = [_resolve_write(db, operation) for operation in operations]
+    condition_refs = [
+        db.collection(condition['collection']).document(condition['doc_id'])
+        for condition in conditions
+    ]
+
+    @async_transactional
+    async def _apply(transaction):
+        # get_all does not preserve order, so index snapshots by path
+        snapshots = {}
+        if condition_refs:
+            async for snapshot in db.get_all(condition_refs, transaction=transaction):
+                snapshots[snapshot.reference.path] = snapshot
+        for index, (doc_ref, condition) in enumerate(zip(condition_refs, conditions)):
+            reason = _check_condition(snapshots[doc_ref.path], condition)
+            if reason:
+                return {'committed': False, 'failed_condition': index, 'reason': reason}
+
+        results = []
+        for index, ((op, doc_ref, data), operation) in enumerate(zip(resolved, operations)):
+            if op == 'create':
+                transaction.create(doc_ref, data)
+            elif op == 'set':
+                transaction.set(doc_ref, data, merge=operation.get('merge', False))
+            elif op == 'update':
+                transaction.update(doc_ref, data)
+            else:
+                transaction.delete(doc_ref)
+            results.append(
+                {'index': index, 'doc_id': doc_ref.id, 'status': 'ok'})
+        return {'committed': True, 'results': results}
+
+    try:
+        return await _apply(db.transaction(max_attempts=max_attempts))
+    finally:
+        await _arecord_writes(*(doc_ref.path for _, doc_ref, _ in resolved))
 
 
 async def list_collections() -> List[str]:
@@ -99,67 +709,505 @@ async def list_collections() -> List[str]:
     Returns:
         List[str]: List of collection names
     """
-    def _list():
+    db = get_async_db()
+    return [col.id async for col in db.collections()]
+
+
+async def list_subcollections(collection: str, doc_id: str) -> List[str]:
+    """
+    List the subcollections of a document.
+
+    Args:
+        collection: The collection name (or path)
+        doc_id: The document ID
+
+    Returns:
+        List[str]: Subcollection IDs
+    """
+    db = get_async_db()
+    doc_ref = db.collection(collection).document(doc_id)
+    return [col.id async for col in doc_ref.collections()]
+
+
+async def export_tree(
+    local_path: str,
+    path: Optional[str] = None,
+    max_concurrency: int = 8
+) -> dict:
+    """
+    Export a document subtree to a local NDJSON file.
+
+    Every document under path (including all nested subcollections) is
+    written as one {"path": ..., "data": {...}} line as soon as it is read,
+    so the tree is never held in memory. Subtrees are walked in parallel.
+
+    Args:
+        local_path: File to write the NDJSON export to, inside
+            settings.MCP_LOCAL_FILES_ROOT
+        path: Collection or document path to export; the whole database
+            when omitted
+        max_concurrency: Maximum Firestore requests in flight
+
+    Returns:
+        dict: {"local_path", "documents", "collections", "bytes"}
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    local_path = resolve_local_path(local_path)
+
+    def _export():
         db = get_db()
-        collections = db.collections()
-        return [col.id for col in collections]
+        lock = threading.Lock()
+        finished = threading.Event()
+        errors = []
+        # pending starts at 1 so the walk can't look finished while the
+        # roots are still being submitted
+        counts = {'documents': 0, 'collections': 0, 'bytes': 0, 'pending': 1}
+        # Bounds document batches waiting in the pool; when none is free the
+        # listing thread exports the batch itself
+        batch_slots = threading.Semaphore(max_concurrency * 2)
+        # Pool threads don't carry the calling context, so bind progress now
+        report = progress_callback()
+
+        with open(local_path, 'wb') as out, ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+
+            def _submit(func, *args):
+                with lock:
+                    counts['pending'] += 1
+                pool.submit(_run, func, *args)
+
+            def _release():
+                with lock:
+                    counts['pending'] -= 1
+                    if counts['pending'] == 0:
+                        finished.set()
+
+            def _run(func, *args):
+                try:
+                    if not errors:
+                        func(*args)
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    _release()
+
+            def _export_collection(collection_ref):
+                with lock:
+                    counts['collections'] += 1
+                refs = []
+                # Unlike stream(), this also lists documents that exist only
+                # as parents of subcollections
+                for doc_ref in collection_ref.list_documents(page_size=EXPORT_BATCH_SIZE):
+                    refs.append(doc_ref)
+                    if len(refs) == EXPORT_BATCH_SIZE:
+                        _dispatch_documents(refs)
+                        refs = []
+                if refs:
+                    _dispatch_documents(refs)
+
+            def _dispatch_documents(refs):
+                if batch_slots.acquire(blocking=False):
+                    _submit(_export_batch, refs)
+                else:
+                    _export_documents(refs)
+
+            def _export_batch(refs):
+                try:
+                    _export_documents(refs)
+                finally:
+                    batch_slots.release()
+
+            def _export_documents(refs):
+                lines = []
+                for snapshot in db.get_all(refs):
+                    if snapshot.exists:
+                        lines.append(encoding.dumps({
+                            'path': snapshot.reference.path,
+                            'data': snapshot.to_dict()
+                        }) + b'\n')
+                with lock:
+                    out.writelines(lines)
+                    before = counts['documents']
+                    counts['documents'] += len(lines)
+                    counts['bytes'] += sum(len(line) for line in lines)
+                    done = counts['documents']
+                if done // PROGRESS_INTERVAL > before // PROGRESS_INTERVAL:
+                    report(done, message=f"Exported {done} documents")
+
+                for doc_ref in refs:
+                    for subcollection in doc_ref.collections():
+                        _submit(_export_collection, subcollection)
+
+            if path is None:
+                roots = [(_export_collection, col) for col in db.collections()]
+            else:
+                reference = _parse_path(db, path)
+                if isinstance(reference, CollectionReference):
+                    roots = [(_export_collection, reference)]
+                else:
+                    roots = [(_export_documents, [reference])]
+
+            for func, arg in roots:
+                _submit(func, arg)
+            _release()
+            finished.wait()
+
+        if errors:
+            raise errors[0]
+        report(counts['documents'], counts['documents'], "Export complete")
+        return {
+            'local_path': local_path,
+            'documents': counts['documents'],
+            'collections': counts['collections'],
+            'bytes': counts['bytes']
+        }
+
+    return await run_in_executor('firestore', _export)
+
+
+def _field_filter(field: str, op: str, value) -> FieldFilter:
+    """Build one field comparison, checking it against Firestore's limits."""
+    if op not in FILTER_OPS:
+        raise ValueError(
+            f"Unsupported filter operator {op!r} on {field!r} (expected one of {', '.join(FILTER_OPS)})")
+    if op in ('in', 'not-in', 'array-contains-any'):
+        if not isinstance(value, list) or not value:
+            raise ValueError(f"'{op}' on {field!r} needs a non-empty list")
+        limit = MAX_NOT_IN_VALUES if op == 'not-in' else MAX_IN_VALUES
+        if len(value) > limit:
+            raise ValueError(
+                f"'{op}' on {field!r} accepts at most {limit} values, got {len(value)}")
+    return FieldFilter(field, op, value)
+
+
+def _build_filter(filters: dict):
+    """
+    Build an SDK filter from a filter dict.
+
+    Each key is a field, compared for equality with a plain value or with
+    operators like {">=": 18, "<": 65}. The keys "$or" and "$and" take a list
+    of nested filter dicts. All entries of one dict are ANDed.
+
+    Returns:
+        FieldFilter, And, Or, or None for an empty filter
+    """
+    if not isinstance(filters, dict):
+        raise ValueError(f"Filters must be objects, got {filters!r}")
+
+    clauses = []
+    for key, value in filters.items():
+        if key in ('$or', '$and'):
+            if not isinstance(value, list) or not value:
+                raise ValueError(f"'{key}' needs a non-empty list of filters")
+            parts = [part for part in map(_build_filter, value) if part is not None]
+            if len(parts) == 1:
+                clauses.append(parts[0])
+            elif parts:
+                clauses.append(Or(parts) if key == '$or' else And(parts))
+        elif isinstance(value, dict):
+            # Operators like {">=": 18}
+            for op, operand in value.items():
+                clauses.append(_field_filter(key, op, operand))
+        else:
+            # Simple equality filter
+            clauses.append(FieldFilter(key, '==', value))
+
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else And(clauses)
+
+
+def _count_disjunctions(node) -> int:
+    """Count the terms of a filter in disjunctive normal form."""
+    if isinstance(node, Or):
+        return sum(_count_disjunctions(part) for part in node.filters)
+    if isinstance(node, And):
+        total = 1
+        for part in node.filters:
+            total *= _count_disjunctions(part)
+        return total
+    if node.op_string in ('in', 'array-contains-any'):
+        return len(node.value)
+    return 1
+
+
+def _conjunctions(node) -> List[List[FieldFilter]]:
+    """Expand $or/$and into the field filters of each disjunction."""
+    if isinstance(node, Or):
+        return [term for part in node.filters for term in _conjunctions(part)]
+    if isinstance(node, And):
+        terms = [[]]
+        for part in node.filters:
+            terms = [term + other for term in terms for other in _conjunctions(part)]
+        return terms
+    return [[node]]
+
+
+def _validate_filter(node):
+    """
+    Reject filters Firestore can't serve before spending an RPC on them.
+
+    Raises:
+        ValueError: Describing the first rule the filter breaks
+    """
+    disjunctions = _count_disjunctions(node)
+    if disjunctions > MAX_DISJUNCTIONS:
+        raise ValueError(
+            f"Filter expands to {disjunctions} disjunctions; Firestore allows at most {MAX_DISJUNCTIONS}")
+
+    terms = _conjunctions(node)
+    ops = [field_filter.op_string for term in terms for field_filter in term]
+    if 'not-in' in ops:
+        if len(terms) > 1 or ops.count('not-in') > 1:
+            raise ValueError("'not-in' can't be combined with $or or another 'not-in'")
+        for other in ('!=', 'in', 'array-contains-any'):
+            if other in ops:
+                raise ValueError(f"'not-in' can't be combined with '{other}'")
+    for term in terms:
+        array_ops = [
+            field_filter.op_string for field_filter in term
+            if field_filter.op_string in ('array-contains', 'array-contains-any')
+        ]
+        if len(array_ops) > 1:
+            raise ValueError(
+                "Each disjunction can use at most one 'array-contains' or 'array-contains-any' filter")
+
+
+def _apply_filters(query, filters: Optional[dict]):
+    """Apply a filter dict (see _build_filter) to a query."""
+    if filters:
+        composite = _build_filter(filters)
+        if composite is not None:
+            _validate_filter(composite)
+            query = query.where(filter=composite)
+    return query
+
+
+def _apply_order(query, order_by: Optional[List[str]]):
+    """Apply a list of order-by fields ("-field" for descending) to a query."""
+    if order_by:
+        for field in order_by:
+            if field.startswith('-'):
+                query = query.order_by(
+                    field[1:], direction=Query.DESCENDING)
+            else:
+                query = query.order_by(field)
+    return query
+
+
+def _encode_cursor(path: str) -> str:
+    """Encode the path of the last document of a page as an opaque page token."""
+    payload = json.dumps({'path': path})
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def _cursor_path(cursor: str) -> str:
+    """Decode a page token back to the path of the document to start after."""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))['path']
+    except (ValueError, KeyError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
 
-    return await asyncio.to_thread(_list)
+
+async def _decode_cursor(db, cursor: str):
+    """Resolve a page token back to the document snapshot to start after."""
+    snapshot = await db.document(_cursor_path(cursor)).get()
+    if not snapshot.exists:
+        raise ValueError(
+            "Cursor document no longer exists; restart the query without a cursor")
+    return snapshot
+
+
+def _page_size(requested: Optional[int]) -> int:
+    """Resolve a requested page size, capped at settings.MCP_QUERY_MAX_PAGE_SIZE."""
+    if requested is None:
+        return settings.MCP_QUERY_PAGE_SIZE
+    if requested < 1:
+        raise ValueError("page_size must be at least 1")
+    # Larger pages are cut to the cap; next_cursor continues from there
+    return min(requested, settings.MCP_QUERY_MAX_PAGE_SIZE)
+
+
+async def _fetch_page(
+    db,
+    query,
+    page_size: int,
+    cursor: Optional[str],
+    fields: Optional[List[str]] = None,
+    include_path: bool = False
+) -> dict:
+    """Run a query for one page of results and build the next page token."""
+    if cursor:
+        query = query.start_after(await _decode_cursor(db, cursor))
+
+    if fields:
+        # Projection: only the requested fields are transferred
+        query = query.select(fields)
+
+    # Fetch one extra document to know whether another page exists
+    query = query.limit(page_size + 1)
+
+    documents = []
+    last_doc = None
+    has_more = False
+    async for doc in query.stream():
+        if len(documents) == page_size:
+            # The extra document only signals that another page exists
+            has_more = True
+            break
+        data = doc.to_dict()
+        data['_id'] = doc.id
+        if include_path:
+            data['_path'] = doc.reference.path
+        documents.append(data)
+        last_doc = doc
+
+    return {
+        'documents': documents,
+        'next_cursor': _encode_cursor(last_doc.reference.path) if has_more else None
+    }
 
 
 async def query_collection(
     collection: str,
     filters: Optional[dict] = None,
     order_by: Optional[List[str]] = None,
-    limit: Optional[int] = None
-) -> List[dict]:
+    limit: Optional[int] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> dict:
     """
-    Query documents from a Firestore collection.
+    Query one page of documents from a Firestore collection.
 
     Args:
         collection: The collection name
-        filters: Dict of field filters (e.g., {"field": "value", "age": {">=": 18}})
+        filters: Dict of field filters (e.g., {"field": "value", "age": {">=": 18}}),
+            with "$or"/"$and" lists for composite filters, e.g.
+            {"$or": [{"status": "active"}, {"tags": {"array-contains-any": ["vip"]}}]}
         order_by: List of fields to order by
-        limit: Maximum number of documents to return
+        limit: Maximum number of documents to return (alias for page_size)
+        page_size: Documents per page (defaults to settings.MCP_QUERY_PAGE_SIZE,
+            at most settings.MCP_QUERY_MAX_PAGE_SIZE)
+        cursor: next_cursor from a previous page, to continue after it
+        fields: Field paths to return for each document (optional)
 
     Returns:
-        List[dict]: List of matching documents
+        dict: {"documents": [...], "next_cursor": str or None}
     """
-    def _query():
-        db = get_db()
-        query = db.collection(collection)
-
-        # Apply filters
-        if filters:
-            for field, value in filters.items():
-                if isinstance(value, dict):
-                    # Handle operators like {">=": 18}
-                    for op, val in value.items():
-                        query = query.where(field, op, val)
-                else:
-                    # Simple equality filter
-                    query = query.where(field, "==", value)
-
-        # Apply ordering
-        if order_by:
-            for field in order_by:
-                if field.startswith('-'):
-                    query = query.order_by(
-                        field[1:], direction=Query.DESCENDING)
-                else:
-                    query = query.order_by(field)
+    page_size = _page_size(page_size if page_size is not None else limit)
 
-        # Apply limit
-        if limit:
-            query = query.limit(limit)
+    mirror = get_mirror(collection) if not order_by else None
+    if mirror is not None:
+        start_after = _cursor_path(cursor).rpartition('/')[2] if cursor else None
+        page = mirror.query(filters, page_size, start_after)
+        if page is not None:
+            documents, has_more = page
+            return {
+                'documents': [_project(document, fields) for document in documents] if fields else documents,
+                'next_cursor': _encode_cursor(
+                    f"{collection}/{documents[-1]['_id']}") if has_more else None
+            }
 
-        docs = query.stream()
-        results = []
-        for doc in docs:
-            data = doc.to_dict()
-            data['_id'] = doc.id
-            results.append(data)
+    db = get_async_db()
+    query = db.collection(collection)
+    query = _apply_filters(query, filters)
+    query = _apply_order(query, order_by)
+    return await _fetch_page(db, query, page_size, cursor, fields)
+
+
+async def query_collection_group(
+    collection_id: str,
+    filters: Optional[dict] = None,
+    order_by: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> dict:
+    """
+    Query one page of documents across every collection with the given ID,
+    wherever it is nested (e.g. all "orders" subcollections of all users).
+
+    Filters and ordering need a collection-group index in Firestore beyond
+    single-field ones.
+
+    Args:
+        collection_id: The collection ID to search, without parent path
+        filters: Field filters, as for query_collection
+        order_by: List of fields to order by
+        limit: Maximum number of documents to return (alias for page_size)
+        page_size: Documents per page (defaults to settings.MCP_QUERY_PAGE_SIZE,
+            at most settings.MCP_QUERY_MAX_PAGE_SIZE)
+        cursor: next_cursor from a previous page, to continue after it
+        fields: Field paths to return for each document (optional)
+
+    Returns:
+        dict: {"documents": [...], "next_cursor": str or None}. Each document
+            carries its full '_path', since IDs repeat across parents.
+    """
+    if '/' in collection_id:
+        raise ValueError(
+            f"collection_id must be a collection ID, not a path: {collection_id!r}")
+    page_size = _page_size(page_size if page_size is not None else limit)
+
+    db = get_async_db()
+    query = db.collection_group(collection_id)
+    query = _apply_filters(query, filters)
+    query = _apply_order(query, order_by)
+    return await _fetch_page(db, query, page_size, cursor, fields, include_path=True)
 
-        return results
 
-    return await asyncio.to_thread(_query)
+async def _aggregate(collection: str, filters: Optional[dict], aggregation):
+    """Run a single aggregation over a filtered collection on the server."""
+    db = get_async_db()
+    query = _apply_filters(db.collection(collection), filters)
+    results = await aggregation(query).get()
+    # One result set holding the one aggregation requested
+    return results[0][0].value
+
+
+async def count_documents(collection: str, filters: Optional[dict] = None) -> int:
+    """
+    Count the documents in a collection matching the filters.
+
+    Runs as a server-side aggregation, so no documents are transferred.
+
+    Args:
+        collection: The collection name
+        filters: Field filters, as for query_collection
+
+    Returns:
+        int: Number of matching documents
+    """
+    return await _aggregate(collection, filters, lambda query: query.count())
+
+
+async def sum_field(collection: str, field: str, filters: Optional[dict] = None) -> float:
+    """
+    Sum a numeric field over the documents matching the filters.
+
+    Args:
+        collection: The collection name
+        field: Field path to sum; non-numeric values are ignored
+        filters: Field filters, as for query_collection
+
+    Returns:
+        float: The sum (an int when every summed value is an int)
+    """
+    return await _aggregate(collection, filters, lambda query: query.sum(field))
+
+
+async def avg_field(collection: str, field: str, filters: Optional[dict] = None) -> Optional[float]:
+    """
+    Average a numeric field over the documents matching the filters.
+
+    Args:
+        collection: The collection name
+        field: Field path to average; non-numeric values are ignored
+        filters: Field filters, as for query_collection
+
+    Returns:
+        float or None: The average, or None if no document has a numeric value
+    """
+    return await _aggregate(collection, filters, lambda query: query.avg(field))
@@ -1,91 +1,230 @@
 """
 Firebase Cloud Storage tools for MCP server.
 """
-import asyncio
 import base64
-from typing import List
-from ..firebase_init import get_bucket
-
-
-async def upload_file(path: str, b64_data: str) -> str:
+import os
+from typing import Optional
+from django.conf import settings
+from ..firebase_init import get_bucket, run_in_executor
+from ..local_files import resolve_local_path
+
+
+async def upload_file(
+    file_path: str,
+    local_path: Optional[str] = None,
+    b64_data: Optional[str] = None,
+    content_type: Optional[str] = None
+) -> str:
     """
     Upload a file to Firebase Cloud Storage.
 
+    With local_path the file is streamed from disk in a resumable upload, one
+    chunk (settings.MCP_STORAGE_CHUNK_SIZE) at a time, so it is never held
+    in memory. b64_data is meant for small inline payloads.
+
     Args:
-        path: The storage path for the file
-        b64_data: Base64 encoded file data
+        file_path: The storage path for the file
+        local_path: File to upload, inside settings.MCP_LOCAL_FILES_ROOT
+        b64_data: Base64 encoded file data, instead of local_path
+        content_type: Content type (optional; guessed from the name otherwise)
 
     Returns:
         str: Public URL of the uploaded file
     """
+    if (local_path is None) == (b64_data is None):
+        raise ValueError("Pass exactly one of local_path or b64_data")
+    if local_path is not None:
+        local_path = resolve_local_path(local_path)
+
     def _upload():
         bucket = get_bucket()
-        # Decode base64 data
-        file_data = base64.b64decode(b64_data)
-
-        # Upload to storage
-        blob = bucket.blob(path)
-        blob.upload_from_string(file_data)
+        blob = bucket.blob(file_path, chunk_size=settings.MCP_STORAGE_CHUNK_SIZE)
+
+        if local_path is not None:
+            blob.upload_from_filename(local_path, content_type=content_type)
+        else:
+            # Decode base64 data
+            file_data = base64.b64decode(b64_data)
+            if content_type:
+                blob.upload_from_string(file_data, content_type=content_type)
+            else:
+                blob.upload_from_string(file_data)
 
         # Make publicly accessible
         blob.make_public()
 
         return blob.public_url
 
-    return await asyncio.to_thread(_upload)
+    return await run_in_executor('storage', _upload)
 
 
-async def download_file(path: str) -> str:
+async def download_file(
+    file_path: str,
+    local_path: Optional[str] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    max_bytes: Optional[int] = None
+):
     """
-    Download a file from Firebase Cloud Storage.
+    Download a file, or a byte range of it, from Firebase Cloud Storage.
+
+    With local_path the file is streamed to disk in ranged chunks
+    (settings.MCP_STORAGE_CHUNK_SIZE), so memory use stays bounded
+    whatever its size. Without it the data is returned inline.
+
+    Passing start, end or max_bytes reads only that range with a range
+    request, e.g. max_bytes=1024 for the first KB of a log, and reports the
+    total size so large files can be read page by page.
 
     Args:
-        path: The storage path of the file
+        file_path: The storage path of the file
+        local_path: Path to save the file to, inside
+            settings.MCP_LOCAL_FILES_ROOT
+        start: First byte offset to read (default 0)
+        end: Last byte offset to read, inclusive (default end of file)
+        max_bytes: Maximum bytes to read from start
 
     Returns:
-        str: Base64 encoded file data
+        dict or str: For a range, {"file_path", "start", "end", "bytes",
+            "size"} with "data" (base64) or "local_path". For a whole file,
+            {"file_path", "local_path", "size"} when saved to local_path,
+            otherwise the base64 encoded file data.
     """
+    ranged = start is not None or end is not None or max_bytes is not None
+    if start is not None and start < 0:
+        raise ValueError("start must not be negative")
+    if end is not None and end < (start or 0):
+        raise ValueError("end must not be before start")
+    if max_bytes is not None and max_bytes < 1:
+        raise ValueError("max_bytes must be at least 1")
+    if local_path is not None:
+        local_path = resolve_local_path(local_path)
+
     def _download():
         bucket = get_bucket()
-        blob = bucket.blob(path)
-        file_data = blob.download_as_bytes()
-        return base64.b64encode(file_data).decode('utf-8')
-
-    return await asyncio.to_thread(_download)
-
-
-async def delete_file(path: str) -> bool:
+        if not ranged:
+            blob = bucket.blob(file_path, chunk_size=settings.MCP_STORAGE_CHUNK_SIZE)
+            if local_path is not None:
+                blob.download_to_filename(local_path)
+                return {
+                    'file_path': file_path,
+                    'local_path': local_path,
+                    'size': os.path.getsize(local_path)
+                }
+            file_data = blob.download_as_bytes()
+            return base64.b64encode(file_data).decode('utf-8')
+
+        # Metadata gives the size to clamp the range to; it also pins the
+        # generation, so every range reads the same version of the file
+        blob = bucket.get_blob(file_path, chunk_size=settings.MCP_STORAGE_CHUNK_SIZE)
+        if blob is None:
+            raise FileNotFoundError(f"No such file in storage: {file_path}")
+        first = start or 0
+        last = blob.size - 1 if end is None else min(end, blob.size - 1)
+        if max_bytes is not None:
+            last = min(last, first + max_bytes - 1)
+        length = max(0, last - first + 1)
+
+        result = {
+            'file_path': file_path,
+            'start': first,
+            'end': last if length else None,
+            'bytes': length,
+            'size': blob.size
+        }
+        if local_path is not None:
+            if length:
+                blob.download_to_filename(local_path, start=first, end=last)
+            else:
+                open(local_path, 'wb').close()
+            result['local_path'] = local_path
+        else:
+            # Ranges past the end of the file read nothing, without a request
+            file_data = blob.download_as_bytes(start=first, end=last) if length else b''
+            result['data'] = base64.b64encode(file_data).decode('utf-8')
+        return result
+
+    return await run_in_executor('storage', _download)
+
+
+async def delete_file(file_path: str) -> bool:
     """
     Delete a file from Firebase Cloud Storage.
 
     Args:
-        path: The storage path of the file to delete
+        file_path: The storage path of the file to delete
 
     Returns:
         bool: True if successful
     """
     def _delete():
         bucket = get_bucket()
-        blob = bucket.blob(path)
+        blob = bucket.blob(file_path)
         blob.delete()
         return True
 
-    return await asyncio.to_thread(_delete)
+    return await run_in_executor('storage', _delete)
 
 
-async def list_files(prefix: str = "") -> List[str]:
+async def list_files(
+    prefix: str = "",
+    max_results: Optional[int] = None,
+    page_token: Optional[str] = None,
+    delimiter: Optional[str] = None,
+    include_metadata: bool = False
+) -> dict:
     """
-    List files in Firebase Cloud Storage.
+    List one page of files in Firebase Cloud Storage.
+
+    Each call makes a single list request, so listing a large bucket is
+    paged with next_page_token instead of walking every object.
 
     Args:
         prefix: Optional prefix to filter files
+        max_results: Files per page (defaults to settings.MCP_STORAGE_LIST_PAGE_SIZE;
+            Cloud Storage returns at most 1000 per request)
+        page_token: next_page_token from a previous page, to continue after it
+        delimiter: List one directory level, e.g. "/"; names below it are
+            returned once each in "prefixes"
+        include_metadata: Return {"name", "size", "updated", "md5_hash"}
+            for each file instead of just its name
 
     Returns:
-        List[str]: List of file paths
+        dict: {"files": [...], "prefixes": [...], "next_page_token": str or None}
     """
+    max_results = max_results or settings.MCP_STORAGE_LIST_PAGE_SIZE
+
     def _list():
         bucket = get_bucket()
-        blobs = bucket.list_blobs(prefix=prefix)
-        return [blob.name for blob in blobs]
-
-    return await asyncio.to_thread(_list)
+        # Partial response: only the fields returned below are transferred
+        item_fields = 'name,size,updated,md5Hash' if include_metadata else 'name'
+        iterator = bucket.list_blobs(
+            prefix=prefix or None,
+            delimiter=delimiter,
+            max_results=max_results,
+            page_token=page_token,
+            fields=f'items({item_fields}),prefixes,nextPageToken'
+        )
+        page = next(iterator.pages, None)
+        blobs = list(page) if page is not None else []
+
+        if include_metadata:
+            files = [
+                {
+                    'name': blob.name,
+                    'size': blob.size,
+                    'updated': blob.updated.isoformat() if blob.updated else None,
+                    'md5_hash': blob.md5_hash
+                }
+                for blob in blobs
+            ]
+        else:
+            files = [blob.name for blob in blobs]
+        return {
+            'files': files,
+            # Filled in by the iterator as it reads the page
+            'prefixes': sorted(iterator.prefixes),
+            'next_page_token': iterator.next_page_token
+        }
+
+    return await run_in_executor('storage', _list)
@@ -1,40 +1,20 @@
 """
 HTTP endpoint for Firebase MCP server.
 """
+from . import encoding
+from .progress import progress_scope
 from .tools import auth, firestore, storage
 import json
 import asyncio
-from datetime import datetime
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
-from rest_framework import status
-from django.http import HttpResponse
+import hashlib
+import orjson
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
-from asgiref.sync import async_to_sync
+from django.views.decorators.http import require_http_methods
 
-# Custom JSON encoder for Firebase objects
-
-
-class FirebaseJSONEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles Firebase-specific objects."""
-
-    def default(self, obj):
-        # Handle Firebase DatetimeWithNanoseconds
-        if hasattr(obj, 'timestamp'):
-            # Convert to ISO format string
-            return obj.isoformat() if hasattr(obj, 'isoformat') else str(obj)
-        # Handle standard datetime objects
-        elif isinstance(obj, datetime):
-            return obj.isoformat()
-        # Handle other non-serializable objects
-        elif hasattr(obj, '__dict__'):
-            return str(obj)
-        return super().default(obj)
-
-
-def safe_json_dumps(obj, **kwargs):
-    """Safely serialize objects to JSON, handling Firebase objects."""
-    return json.dumps(obj, cls=FirebaseJSONEncoder, **kwargs)
+# Target size of the byte chunks written to SSE streams
+SSE_CHUNK_SIZE = 64 * 1024
 
 
 # Import all tool modules to register the tools
@@ -46,17 +26,44 @@ TOOLS = {
     'get_user': auth.get_user,
     'delete_user': auth.delete_user,
     'get_document': firestore.get_document,
+    'get_documents': firestore.get_documents,
     'create_document': firestore.create_document,
     'update_document': firestore.update_document,
     'delete_document': firestore.delete_document,
+    'batch_write': firestore.batch_write,
+    'transact': firestore.transact,
+    'delete_collection': firestore.delete_collection,
     'list_collections': firestore.list_collections,
+    'list_subcollections': firestore.list_subcollections,
+    'export_tree': firestore.export_tree,
     'query_collection': firestore.query_collection,
+    'query_collection_group': firestore.query_collection_group,
+    'count_documents': firestore.count_documents,
+    'sum_field': firestore.sum_field,
+    'avg_field': firestore.avg_field,
     'upload_file': storage.upload_file,
     'download_file': storage.download_file,
     'delete_file': storage.delete_file,
     'list_files': storage.list_files,
 }
 
+# Write operation items shared by batch_write and transact
+WRITE_OPERATIONS_SCHEMA = {
+    'type': 'array',
+    'description': 'Write operations, applied in order',
+    'items': {
+        'type': 'object',
+        'properties': {
+            'op': {'type': 'string', 'enum': ['create', 'set', 'update', 'delete']},
+            'collection': {'type': 'string', 'description': 'Collection name'},
+            'doc_id': {'type': 'string', 'description': 'Document ID (optional for create/set)'},
+            'data': {'type': 'object', 'description': 'Document data (not used by delete). Field values may be transforms applied atomically on the server: {\"$increment\": n}, {\"$arrayUnion\": [...]}, {\"$arrayRemove\": [...]}, {\"$serverTimestamp\": true}, {\"$delete\": true}'},
+            'merge': {'type': 'boolean', 'description': 'Merge instead of overwrite (set only)'}
+        },
+        'required': ['op', 'collection']
+    }
+}
+
 # Tool descriptions for MCP protocol
 TOOL_DESCRIPTIONS = {
     'verify_id_token': {
@@ -111,11 +118,36 @@ TOOL_DESCRIPTIONS = {
             'type': 'object',
             'properties': {
                 'collection': {'type': 'string', 'description': 'Collection name'},
-                'document_id': {'type': 'string', 'description': 'Document ID'}
+                'document_id': {'type': 'string', 'description': 'Document ID'},
+                'use_cache': {'type': 'boolean', 'description': 'Serve from the document cache when enabled (default true)'},
+                'fields': {'type': 'array', 'items': {'type': 'string'}, 'description': 'Field paths to return, e.g. ["name", "address.city"] (optional)'}
             },
             'required': ['collection', 'document_id']
         }
     },
+    'get_documents': {
+        'name': 'get_documents',
+        'description': 'Get multiple Firestore documents in one batched read',
+        'inputSchema': {
+            'type': 'object',
+            'properties': {
+                'documents': {
+                    'type': 'array',
+                    'description': 'Document references to fetch; results keep this order',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'collection': {'type': 'string', 'description': 'Collection name'},
+                            'doc_id': {'type': 'string', 'description': 'Document ID'}
+                        },
+                        'required': ['collection', 'doc_id']
+                    }
+                },
+                'fields': {'type': 'array', 'items': {'type': 'string'}, 'description': 'Field paths to return, e.g. ["name", "address.city"] (optional)'}
+            },
+            'required': ['documents']
+        }
+    },
     'create_document': {
         'name': 'create_document',
         'description': 'Create Firestore document',
@@ -124,7 +156,8 @@ TOOL_DESCRIPTIONS = {
             'properties': {
                 'collection': {'type': 'string', 'description': 'Collection name'},
                 'document_id': {'type': 'string', 'description': 'Document ID (optional)'},
-                'data': {'type': 'object', 'description': 'Document data'}
+                'data': {'type': 'object', 'description': 'Document data'},
+                'transforms': {'type': 'boolean', 'description': 'Decode field transforms in data, as in update_document (optional, default false)'}
             },
             'required': ['collection', 'data']
         }
@@ -137,7 +170,8 @@ TOOL_DESCRIPTIONS = {
             'properties': {
                 'collection': {'type': 'string', 'description': 'Collection name'},
                 'document_id': {'type': 'string', 'description': 'Document ID'},
-                'data': {'type': 'object', 'description': 'Document data to update'}
+                'data': {'type': 'object', 'description': 'Document data to update'},
+                'transforms': {'type': 'boolean', 'description': 'Decode field transforms in data, applied atomically on the server: {\"$increment\": n}, {\"$arrayUnion\": [...]}, {\"$arrayRemove\": [...]}, {\"$serverTimestamp\": true}, {\"$delete\": true} (optional, default false)'}
             },
             'required': ['collection', 'document_id', 'data']
         }
@@ -154,6 +188,19 @@ TOOL_DESCRIPTIONS = {
             'required': ['collection', 'document_id']
         }
     },
+    'batch_write': {
+        'name': 'batch_write',
+        'description': 'Apply many Firestore writes at once (atomic up to 500 ops, bulk above)',
+        'inputSchema': {
+            'type': 'object',
+            'properties': {
+                'operations': WRITE_OPERATIONS_SCHEMA,
+                'atomic': {'type': 'boolean', 'description': 'Commit all operations in one atomic batch (optional, max 500)'},
+                'max_retries': {'type': 'integer', 'description': 'Retries per throttled write in bulk mode (optional)'}
+            },
+            'required': ['operations']
+        }
+    },
     'list_collections': {
         'name': 'list_collections',
         'description': 'List Firestore collections',
@@ -163,41 +210,173 @@ TOOL_DESCRIPTIONS = {
             'required': []
         }
     },
+    'transact': {
+        'name': 'transact',
+        'description': 'Check conditions and apply writes atomically in a Firestore transaction, retried on contention',
+        'inputSchema': {
+            'type': 'object',
+            'properties': {
+                'operations': WRITE_OPERATIONS_SCHEMA,
+                'conditions': {
+                    'type': 'array',
+                    'description': 'Checks read inside the transaction; if any fails nothing is written (optional)',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'collection': {'type': 'string', 'description': 'Collection name'},
+                            'doc_id': {'type': 'string', 'description': 'Document ID'},
+                            'exists': {'type': 'boolean', 'description': 'Require the document to exist (or not)'},
+                            'field': {'type': 'string', 'description': 'Field path to compare'},
+                            'op': {'type': 'string', 'enum': ['==', '!=', '<', '<=', '>', '>=', 'in', 'not-in', 'array-contains'], 'description': 'Comparison (default ==)'},
+                            'value': {'description': 'Value to compare against'}
+                        },
+                        'required': ['collection', 'doc_id']
+                    }
+                },
+                'max_attempts': {'type': 'integer', 'description': 'Attempts before giving up on contention (optional, default 5)'}
+            },
+            'required': ['operations']
+        }
+    },
+    'delete_collection': {
+        'name': 'delete_collection',
+        'description': 'Recursively delete a Firestore collection, or a document with all its subcollections',
+        'inputSchema': {
+            'type': 'object',
+            'properties': {
+                'path': {'type': 'string', 'description': 'Collection path (e.g. "test_users") or document path (e.g. "users/abc")'},
+                'dry_run': {'type': 'boolean', 'description': 'Only count the documents that would be deleted (optional)'},
+                'chunk_size': {'type': 'integer', 'description': 'Document references fetched per query page (optional, default 5000)'},
+                'max_ops_per_second': {'type': 'integer', 'description': 'Delete throughput ceiling (optional, default 500)'},
+                'max_retries': {'type': 'integer', 'description': 'Retry attempts per throttled delete (optional, default 5)'}
+            },
+            'required': ['path']
+        }
+    },
+    'list_subcollections': {
+        'name': 'list_subcollections',
+        'description': 'List the subcollections of a Firestore document',
+        'inputSchema': {
+            'type': 'object',
+            'properties': {
+                'collection': {'type': 'string', 'description': 'Collection name or path'},
+                'doc_id': {'type': 'string', 'description': 'Document ID'}
+            },
+            'required': ['collection', 'doc_id']
+        }
+    },
+    'export_tree': {
+        'name': 'export_tree',
+        'description': 'Export a Firestore collection or document, with all nested subcollections, to a local NDJSON file',
+        'inputSchema': {
+            'type': 'object',
+            'properties': {
+                'local_path': {'type': 'string', 'description': 'File to write the export to, inside the server\'s MCP_LOCAL_FILES_ROOT (relative paths are taken from it)'},
+                'path': {'type': 'string', 'description': 'Collection or document path to export; the whole database when omitted (optional)'},
+                'max_concurrency': {'type': 'integer', 'description': 'Maximum Firestore requests in flight (optional, default 8)'}
+            },
+            'required': ['local_path']
+        }
+    },
     'query_collection': {
         'name': 'query_collection',
-        'description': 'Query Firestore collection',
+        'description': 'Query Firestore collection, one page at a time',
+        'inputSchema': {
+            'type': 'object',
+            'properties': {
+                'collection': {'type': 'string', 'description': 'Collection name'},
+                'filters': {'type': 'object', 'description': 'Field filters, e.g. {"status": "active", "age": {">=": 18}}. Operators: ==, !=, <, <=, >, >=, in, not-in, array-contains, array-contains-any. Combine nested filters with "$or"/"$and" lists, e.g. {"$or": [{"status": "active"}, {"role": {"in": ["admin", "owner"]}}]} (optional)'},
+                'order_by': {'type': 'array', 'items': {'type': 'string'}, 'description': 'Fields to order by, prefix with "-" for descending (optional)'},
+                'limit': {'type': 'integer', 'description': 'Limit results (optional, alias for page_size)'},
+                'page_size': {'type': 'integer', 'description': f'Documents per page (optional, default {settings.MCP_QUERY_PAGE_SIZE}, max {settings.MCP_QUERY_MAX_PAGE_SIZE})'},
+                'cursor': {'type': 'string', 'description': 'next_cursor from the previous page (optional)'},
+                'fields': {'type': 'array', 'items': {'type': 'string'}, 'description': 'Field paths to return, e.g. ["name", "address.city"] (optional)'}
+            },
+            'required': ['collection']
+        }
+    },
+    'query_collection_group': {
+        'name': 'query_collection_group',
+        'description': 'Query every Firestore collection with the given ID, at any nesting level, one page at a time',
+        'inputSchema': {
+            'type': 'object',
+            'properties': {
+                'collection_id': {'type': 'string', 'description': 'Collection ID to search across all parents, e.g. "orders"'},
+                'filters': {'type': 'object', 'description': 'Field filters, as for query_collection (optional)'},
+                'order_by': {'type': 'array', 'items': {'type': 'string'}, 'description': 'Fields to order by, prefix with "-" for descending (optional)'},
+                'limit': {'type': 'integer', 'description': 'Limit results (optional, alias for page_size)'},
+                'page_size': {'type': 'integer', 'description': f'Documents per page (optional, default {settings.MCP_QUERY_PAGE_SIZE}, max {settings.MCP_QUERY_MAX_PAGE_SIZE})'},
+                'cursor': {'type': 'string', 'description': 'next_cursor from the previous page (optional)'},
+                'fields': {'type': 'array', 'items': {'type': 'string'}, 'description': 'Field paths to return (optional)'}
+            },
+            'required': ['collection_id']
+        }
+    },
+    'count_documents': {
+        'name': 'count_documents',
+        'description': 'Count Firestore documents matching filters (server-side aggregation)',
         'inputSchema': {
             'type': 'object',
             'properties': {
                 'collection': {'type': 'string', 'description': 'Collection name'},
-                'limit': {'type': 'integer', 'description': 'Limit results (optional)'}
+                'filters': {'type': 'object', 'description': 'Field filters, as for query_collection (optional)'}
             },
             'required': ['collection']
         }
     },
+    'sum_field': {
+        'name': 'sum_field',
+        'description': 'Sum a numeric field over Firestore documents matching filters (server-side aggregation)',
+        'inputSchema': {
+            'type': 'object',
+            'properties': {
+                'collection': {'type': 'string', 'description': 'Collection name'},
+                'field': {'type': 'string', 'description': 'Numeric field path to sum'},
+                'filters': {'type': 'object', 'description': 'Field filters, as for query_collection (optional)'}
+            },
+            'required': ['collection', 'field']
+        }
+    },
+    'avg_field': {
+        'name': 'avg_field',
+        'description': 'Average a numeric field over Firestore documents matching filters (server-side aggregation)',
+        'inputSchema': {
+            'type': 'object',
+            'properties': {
+                'collection': {'type': 'string', 'description': 'Collection name'},
+                'field': {'type': 'string', 'description': 'Numeric field path to average'},
+                'filters': {'type': 'object', 'description': 'Field filters, as for query_collection (optional)'}
+            },
+            'required': ['collection', 'field']
+        }
+    },
     'upload_file': {
         'name': 'upload_file',
-        'description': 'Upload file to Firebase Storage',
+        'description': 'Upload file to Firebase Storage, streamed from a local path or inline as base64',
         'inputSchema': {
             'type': 'object',
             'properties': {
                 'file_path': {'type': 'string', 'description': 'Remote file path in storage'},
-                'local_path': {'type': 'string', 'description': 'Local file path to upload'},
+                'local_path': {'type': 'string', 'description': 'File to upload, inside the server\'s MCP_LOCAL_FILES_ROOT (relative paths are taken from it; streamed in chunks)'},
+                'b64_data': {'type': 'string', 'description': 'Base64 file data, instead of local_path (small files only)'},
                 'content_type': {'type': 'string', 'description': 'Content type (optional)'}
             },
-            'required': ['file_path', 'local_path']
+            'required': ['file_path']
         }
     },
     'download_file': {
         'name': 'download_file',
-        'description': 'Download file from Firebase Storage',
+        'description': 'Download file, or a byte range of it, from Firebase Storage to a local path (streamed in chunks), or inline as base64',
         'inputSchema': {
             'type': 'object',
             'properties': {
                 'file_path': {'type': 'string', 'description': 'Remote file path in storage'},
-                'local_path': {'type': 'string', 'description': 'Local path to save file'}
+                'local_path': {'type': 'string', 'description': 'Path to save the file to, inside the server\'s MCP_LOCAL_FILES_ROOT (optional; base64 data is returned without it)'},
+                'start': {'type': 'integer', 'description': 'First byte offset to read (optional, default 0)'},
+                'end': {'type': 'integer', 'description': 'Last byte offset to read, inclusive (optional)'},
+                'max_bytes': {'type': 'integer', 'description': 'Maximum bytes to read from start (optional)'}
             },
-            'required': ['file_path', 'local_path']
+            'required': ['file_path']
         }
     },
     'delete_file': {
@@ -213,12 +392,15 @@ TOOL_DESCRIPTIONS = {
     },
     'list_files': {
         'name': 'list_files',
-        'description': 'List files in Firebase Storage',
+        'description': 'List one page of files in Firebase Storage, optionally one directory level at a time',
         'inputSchema': {
             'type': 'object',
             'properties': {
                 'prefix': {'type': 'string', 'description': 'Path prefix (optional)'},
-                'max_results': {'type': 'integer', 'description': 'Maximum results (optional)'}
+                'max_results': {'type': 'integer', 'description': 'Files per page (optional, max 1000 per request)'},
+                'page_token': {'type': 'string', 'description': 'next_page_token from a previous page (optional)'},
+                'delimiter': {'type': 'string', 'description': 'Directory separator, e.g. "/", to list one level; subdirectories are returned in prefixes (optional)'},
+                'include_metadata': {'type': 'boolean', 'description': 'Return name, size, updated and md5_hash for each file (optional)'}
             },
             'required': []
         }
@@ -226,15 +408,368 @@ TOOL_DESCRIPTIONS = {
 }
 
 
-@api_view(['POST', 'GET', 'OPTIONS'])
+# Static payloads, serialized once at import. Tool metadata cannot change
+# for the lifetime of the process, so GET and tools/list never rebuild it.
+TOOLS_LIST = list(TOOL_DESCRIPTIONS.values())
+TOOLS_LIST_RESULT = {'tools': TOOLS_LIST}
+TOOLS_LIST_JSON = encoding.dumps(TOOLS_LIST)
+
+SERVER_INFO_JSON = json.dumps({
+    'name': 'Firebase MCP Server',
+    'version': '1.0.0',
+    'description': 'Firebase Admin SDK MCP Server for Django',
+    'protocol': 'JSON-RPC 2.0',
+    'transport': 'HTTP',
+    'capabilities': {
+        'tools': True,
+        'initialize': True
+    },
+    'tools': TOOLS_LIST
+}, indent=2).encode('utf-8')
+
+
+def _etag(payload):
+    """Strong ETag for a static payload."""
+    return '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+
+
+SERVER_INFO_ETAG = _etag(SERVER_INFO_JSON)
+TOOLS_LIST_ETAG = _etag(TOOLS_LIST_JSON)
+
+
+def _rpc_error(code, message, request_id):
+    """Build a JSON-RPC 2.0 error response object."""
+    return {
+        'jsonrpc': '2.0',
+        'error': {
+            'code': code,
+            'message': message
+        },
+        'id': request_id
+    }
+
+
+def _json_response(data, status=200):
+    """Wrap a response payload in a CORS-enabled JSON HttpResponse."""
+    response = HttpResponse(
+        encoding.dumps(data),
+        content_type='application/json',
+        status=status
+    )
+    response['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
+def _with_cache_headers(response, etag):
+    """Mark a static payload response as cacheable and add CORS."""
+    response['ETag'] = etag
+    response['Cache-Control'] = f'public, max-age={settings.MCP_TOOLS_CACHE_MAX_AGE}'
+    response['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
+def _tools_list_response(request_id):
+    """Build a tools/list response around the precomputed tool list bytes."""
+    body = (
+        b'{"jsonrpc": "2.0", "result": {"tools": ' + TOOLS_LIST_JSON
+        + b'}, "id": ' + encoding.dumps(request_id) + b'}'
+    )
+    response = HttpResponse(body, content_type='application/json')
+    # The body echoes the request id, so it differs per request: the ETag
+    # is weak (it identifies the tool list only) and nothing may cache it
+    response['ETag'] = 'W/' + TOOLS_LIST_ETAG
+    response['Cache-Control'] = 'private, no-store'
+    response['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
+# Ways a tools/call result can be returned: JSON text content only,
+# text plus structuredContent, or structuredContent only
+RESULT_FORMATS = ('text', 'both', 'structured')
+
+
+def _structured_content(result):
+    """structuredContent must be a JSON object, so wrap anything else."""
+    return result if isinstance(result, dict) else {'result': result}
+
+
+def _tool_result(result, result_format):
+    """Build the MCP tools/call result for a tool's return value."""
+    tool_result = {'content': []}
+    if result_format != 'structured':
+        tool_result['content'].append({
+            'type': 'text',
+            'text': encoding.dumps(result).decode('utf-8')
+        })
+    if result_format != 'text':
+        tool_result['structuredContent'] = _structured_content(result)
+    return tool_result
+
+
+class _StreamedToolResult:
+    """Raw tool output whose content is encoded while it is streamed."""
+
+    def __init__(self, value, result_format):
+        self.value = value
+        self.result_format = result_format
+
+
+def _is_request(message):
+    """Return True for JSON-RPC requests, which expect a response."""
+    return isinstance(message, dict) and 'method' in message and 'id' in message
+
+
+async def _handle_message(data, stream=False):
+    """
+    Dispatch a single JSON-RPC 2.0 message.
+
+    Args:
+        data: The decoded JSON-RPC message
+        stream: Leave tools/call results unencoded for the SSE writer
+
+    Returns:
+        tuple: (response_data, status). response_data is None for
+        notifications, which must not be answered.
+    """
+    # Validate JSON-RPC 2.0 format
+    if not isinstance(data, dict) or data.get('jsonrpc') != '2.0':
+        request_id = data.get('id') if isinstance(data, dict) else None
+        return _rpc_error(-32600, 'Invalid Request', request_id), 400
+
+    method = data.get('method')
+    params = data.get('params', {})
+    request_id = data.get('id')
+
+    # Handle initialize method - required for MCP protocol
+    if method == 'initialize':
+        # Return server capabilities and info
+        return {
+            'jsonrpc': '2.0',
+            'result': {
+                'protocolVersion': '2024-11-05',
+                'capabilities': {
+                    'tools': {
+                        'listChanged': False
+                    }
+                },
+                'serverInfo': {
+                    'name': 'Firebase MCP Server',
+                    'version': '1.0.0'
+                }
+            },
+            'id': request_id
+        }, 200
+
+    # Handle tools/list method
+    elif method == 'tools/list':
+        return {
+            'jsonrpc': '2.0',
+            'result': TOOLS_LIST_RESULT,
+            'id': request_id
+        }, 200
+
+    # Handle notifications/initialized method
+    elif method == 'notifications/initialized':
+        # This is a notification (no response needed)
+        return None, 204
+
+    # Handle tools/call method
+    elif method == 'tools/call':
+        if not isinstance(params, dict):
+            return _rpc_error(-32602, 'Invalid params: params must be an object', request_id), 400
+        tool_name = params.get('name')
+        tool_arguments = params.get('arguments', {})
+        meta = params.get('_meta') or {}
+        if not isinstance(tool_arguments, dict) or not isinstance(meta, dict):
+            return _rpc_error(
+                -32602, 'Invalid params: arguments and _meta must be objects', request_id), 400
+        result_format = meta.get('resultFormat', settings.MCP_RESULT_FORMAT)
+
+        if not isinstance(tool_name, str) or tool_name not in TOOLS:
+            return _rpc_error(-32601, f'Tool not found: {tool_name}', request_id), 404
+        if result_format not in RESULT_FORMATS:
+            return _rpc_error(
+                -32602,
+                f"Invalid params: resultFormat must be one of {', '.join(RESULT_FORMATS)}",
+                request_id
+            ), 400
+
+        try:
+            # Await the tool coroutine directly on the running loop
+            tool_func = TOOLS[tool_name]
+            result = await tool_func(**tool_arguments)
+
+            if stream:
+                return {
+                    'jsonrpc': '2.0',
+                    'result': _StreamedToolResult(result, result_format),
+                    'id': request_id
+                }, 200
+
+            return {
+                'jsonrpc': '2.0',
+                'result': _tool_result(result, result_format),
+                'id': request_id
+            }, 200
+
+        except Exception as e:
+            return _rpc_error(-32000, f'Tool execution error: {str(e)}', request_id), 500
+
+    # Unknown method
+    return _rpc_error(-32601, f'Method not found: {method}', request_id), 404
+
+
+async def _handle_batch(messages):
+    """
+    Dispatch a JSON-RPC 2.0 batch.
+
+    Entries run concurrently, bounded by ``settings.MCP_BATCH_CONCURRENCY``.
+    Responses keep the order of the requests they answer; notifications
+    produce no entry.
+
+    Args:
+        messages: The decoded batch array
+
+    Returns:
+        list: Response objects in request order
+    """
+    semaphore = asyncio.Semaphore(settings.MCP_BATCH_CONCURRENCY)
+
+    async def _run(message):
+        try:
+            async with semaphore:
+                response_data, _ = await _handle_message(message)
+        except Exception as e:
+            # One failing entry must not take down the rest of the batch
+            request_id = message.get('id') if isinstance(message, dict) else None
+            response_data = _rpc_error(-32000, f'Internal server error: {str(e)}', request_id)
+        # Requests without an id are notifications and are never answered
+        if isinstance(message, dict) and 'id' not in message:
+            return None
+        return response_data
+
+    results = await asyncio.gather(*(_run(message) for message in messages))
+    return [result for result in results if result is not None]
+
+
+def _iter_sse_event(message):
+    """
+    Yield one SSE ``message`` event as byte chunks.
+
+    Tool results are JSON-encoded incrementally, so neither the result JSON
+    nor the enclosing response is ever built as one string. For text
+    content the pieces are escaped chunk by chunk into the string value.
+    """
+    result = message.get('result')
+    if not isinstance(result, _StreamedToolResult):
+        yield b'event: message\ndata: ' + encoding.dumps(message) + b'\n\n'
+        return
+
+    buffer = [
+        b'event: message\ndata: {"jsonrpc": "2.0", "id": '
+        + encoding.dumps(message['id'])
+        + b', "result": {"content": ['
+    ]
+    size = 0
+
+    def _pieces():
+        if result.result_format != 'structured':
+            yield b'{"type": "text", "text": "'
+            for chunk in encoding.iter_dumps(result.value):
+                # Escape each piece as the inside of a JSON string
+                yield encoding.dumps(chunk.decode('utf-8'))[1:-1]
+            yield b'"}'
+        yield b']'
+        if result.result_format != 'text':
+            yield b', "structuredContent": '
+            yield from encoding.iter_dumps(_structured_content(result.value))
+        yield b'}}\n\n'
+
+    for piece in _pieces():
+        buffer.append(piece)
+        size += len(piece)
+        if size >= SSE_CHUNK_SIZE:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    yield b''.join(buffer)
+
+
+async def _event_stream(messages):
+    """
+    Run JSON-RPC messages and stream their responses as Server-Sent Events.
+
+    Progress notifications reported by the tools are sent as they are
+    produced; each response is sent as soon as its call finishes.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(settings.MCP_BATCH_CONCURRENCY)
+
+    async def _run(message):
+        params = message.get('params') if isinstance(message, dict) else None
+        meta = params.get('_meta') if isinstance(params, dict) else None
+        progress_token = meta.get('progressToken') if isinstance(meta, dict) else None
+        try:
+            async with semaphore:
+                with progress_scope(progress_token, queue, loop):
+                    response_data, _ = await _handle_message(message, stream=True)
+        except Exception as e:
+            request_id = message.get('id') if isinstance(message, dict) else None
+            response_data = _rpc_error(-32000, f'Internal server error: {str(e)}', request_id)
+        # Notifications are never answered
+        if isinstance(message, dict) and 'id' not in message:
+            response_data = None
+        # Tuples mark a finished call; bare dicts are progress notifications.
+        # Progress is queued via call_soon_threadsafe, so the result goes the
+        # same way to stay behind any report made before the call returned
+        loop.call_soon_threadsafe(queue.put_nowait, (response_data,))
+
+    tasks = [asyncio.ensure_future(_run(message)) for message in messages]
+    pending = len(tasks)
+    try:
+        while pending:
+            item = await queue.get()
+            if isinstance(item, tuple):
+                pending -= 1
+                item = item[0]
+                if item is None:
+                    continue
+            for chunk in _iter_sse_event(item):
+                yield chunk
+    finally:
+        # Stop outstanding calls if the client disconnects
+        for task in tasks:
+            task.cancel()
+
+
+def _sse_response(messages):
+    """Build the streamable-HTTP SSE response for a list of messages."""
+    response = StreamingHttpResponse(
+        _event_stream(messages),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    response['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
 @csrf_exempt
-def mcp_handler(request):
+@require_http_methods(['POST', 'GET', 'OPTIONS'])
+async def mcp_handler(request):
     """
     Handle MCP HTTP requests directly without using FastMCP's Starlette app.
 
+    The view is a native async view: under ASGI the tool coroutines are
+    awaited directly on the server event loop instead of being wrapped in
+    ``async_to_sync`` for every call.
+
     This implements the basic MCP HTTP protocol:
     - GET requests return server info and available tools
-    - POST requests handle JSON-RPC 2.0 method calls
+    - POST requests handle JSON-RPC 2.0 method calls, single or batched
+    - POST requests accepting text/event-stream get their responses, and
+      any progress notifications, streamed as Server-Sent Events
     """
     try:        # Handle CORS preflight
         if request.method == 'OPTIONS':
@@ -247,225 +782,75 @@ def mcp_handler(request):
         if request.method == 'GET':
             accept_header = request.headers.get('Accept', '')
 
-            # If client expects SSE, return 406 Not Acceptable since we don't support SSE
+            # Streamable HTTP: there is no standalone server-to-client stream,
+            # so SSE on GET is answered with 405 as the transport requires
             if 'text/event-stream' in accept_header:
                 response_data = {
-                    'error': 'SSE not supported',
-                    'message': 'This server only supports JSON-RPC 2.0 over HTTP POST',
+                    'error': 'SSE stream not offered on GET',
+                    'message': 'Send JSON-RPC 2.0 over POST with Accept: text/event-stream to stream responses',
                     'supported_methods': ['POST with JSON-RPC 2.0']
                 }
-                response = HttpResponse(
-                    json.dumps(response_data),
-                    content_type='application/json',
-                    status=406  # Not Acceptable
-                )
-                response['Access-Control-Allow-Origin'] = '*'
+                response = _json_response(response_data, status=405)  # Method Not Allowed
+                response['Allow'] = 'POST, OPTIONS'
                 return response
 
-            # Return server info for regular GET requests
-            server_info = {
-                'name': 'Firebase MCP Server',
-                'version': '1.0.0',
-                'description': 'Firebase Admin SDK MCP Server for Django',
-                'protocol': 'JSON-RPC 2.0',
-                'transport': 'HTTP',
-                'capabilities': {
-                    'tools': True,
-                    'initialize': True
-                },
-                'tools': list(TOOL_DESCRIPTIONS.values())
-            }
-            response = HttpResponse(
-                json.dumps(server_info, indent=2),
-                content_type='application/json'
-            )
-            response['Access-Control-Allow-Origin'] = '*'
-            return response
+            # Return precomputed server info for regular GET requests
+            if_none_match = request.headers.get('If-None-Match', '')
+            if SERVER_INFO_ETAG in if_none_match or if_none_match.strip() == '*':
+                response = HttpResponse(status=304)  # Not Modified
+            else:
+                response = HttpResponse(
+                    SERVER_INFO_JSON,
+                    content_type='application/json'
+                )
+            return _with_cache_headers(response, SERVER_INFO_ETAG)
 
         # Handle POST requests - JSON-RPC 2.0 calls
-        if request.method == 'POST':
-            try:
-                data = json.loads(request.body)
-            except json.JSONDecodeError:
-                return HttpResponse(
-                    json.dumps({
-                        'jsonrpc': '2.0',
-                        'error': {
-                            'code': -32700,
-                            'message': 'Parse error'
-                        },
-                        'id': None
-                    }),
-                    content_type='application/json',
-                    status=400
-                )
+        try:
+            data = orjson.loads(request.body)
+        except orjson.JSONDecodeError:
+            return _json_response(_rpc_error(-32700, 'Parse error', None), status=400)
 
-            # Validate JSON-RPC 2.0 format
-            if not isinstance(data, dict) or data.get('jsonrpc') != '2.0':
-                return HttpResponse(
-                    json.dumps({
-                        'jsonrpc': '2.0',
-                        'error': {
-                            'code': -32600,
-                            'message': 'Invalid Request'
-                        },
-                        'id': data.get('id')
-                    }),
-                    content_type='application/json',
-                    status=400
-                )
+        # Handle batch requests
+        is_batch = isinstance(data, list)
+        if is_batch:
+            if not data:
+                return _json_response(_rpc_error(-32600, 'Invalid Request', None), status=400)
+            if len(data) > settings.MCP_MAX_BATCH_SIZE:
+                return _json_response(_rpc_error(
+                    -32600,
+                    f'Batch too large: {len(data)} > {settings.MCP_MAX_BATCH_SIZE}',
+                    None
+                ), status=400)
 
-            method = data.get('method')
-            params = data.get('params', {})
-            # Handle initialize method - required for MCP protocol
-            request_id = data.get('id')
-            if method == 'initialize':
-                # Return server capabilities and info
-                response_data = {
-                    'jsonrpc': '2.0',
-                    'result': {
-                        'protocolVersion': '2024-11-05',
-                        'capabilities': {
-                            'tools': {
-                                'listChanged': False
-                            }
-                        },
-                        'serverInfo': {
-                            'name': 'Firebase MCP Server',
-                            'version': '1.0.0'
-                        }
-                    },
-                    'id': request_id
-                }
-                response = HttpResponse(
-                    json.dumps(response_data),
-                    content_type='application/json'
-                )
-                response['Access-Control-Allow-Origin'] = '*'
-                return response
+        # Streamable HTTP: answer requests over SSE when the client accepts it
+        messages = data if is_batch else [data]
+        accept_header = request.headers.get('Accept', '')
+        if 'text/event-stream' in accept_header and any(_is_request(message) for message in messages):
+            return _sse_response(messages)
 
-            # Handle tools/list method
-            elif method == 'tools/list':
-                response_data = {
-                    'jsonrpc': '2.0',
-                    'result': {
-                        'tools': list(TOOL_DESCRIPTIONS.values())
-                    },
-                    'id': request_id
-                }
-                response = HttpResponse(
-                    json.dumps(response_data),
-                    content_type='application/json'
-                )
-                response['Access-Control-Allow-Origin'] = '*'
-                return response
+        # Fast path: splice the precomputed tool list into the envelope
+        if not is_batch and _is_request(data) and data.get('jsonrpc') == '2.0' \
+                and data['method'] == 'tools/list':
+            return _tools_list_response(data['id'])
 
-            # Handle notifications/initialized method
-            elif method == 'notifications/initialized':
-                # This is a notification (no response needed)
-                response = HttpResponse(
-                    '',
-                    content_type='application/json',
-                    status=204  # No Content
-                )
+        if is_batch:
+            responses = await _handle_batch(data)
+            if not responses:
+                # A batch of notifications only gets no body
+                response = HttpResponse('', content_type='application/json', status=204)
                 response['Access-Control-Allow-Origin'] = '*'
                 return response
+            return _json_response(responses)
 
-            # Handle tools/call method
-            elif method == 'tools/call':
-                tool_name = params.get('name')
-                tool_arguments = params.get('arguments', {})
-
-                if tool_name not in TOOLS:
-                    response_data = {
-                        'jsonrpc': '2.0',
-                        'error': {
-                            'code': -32601,
-                            'message': f'Tool not found: {tool_name}'
-                        },
-                        'id': request_id
-                    }
-                    response = HttpResponse(
-                        json.dumps(response_data),
-                        content_type='application/json',
-                        status=404
-                    )
-                    response['Access-Control-Allow-Origin'] = '*'
-                    return response
-
-                try:                    # Call the tool function
-                    tool_func = TOOLS[tool_name]
-                    result = async_to_sync(tool_func)(**tool_arguments)
-
-                    response_data = {
-                        'jsonrpc': '2.0',
-                        'result': {
-                            'content': [
-                                {
-                                    'type': 'text',
-                                    'text': safe_json_dumps(result, indent=2)
-                                }
-                            ]
-                        },
-                        'id': request_id
-                    }
-                    response = HttpResponse(
-                        json.dumps(response_data),
-                        content_type='application/json'
-                    )
-                    response['Access-Control-Allow-Origin'] = '*'
-                    return response
-
-                except Exception as e:
-                    response_data = {
-                        'jsonrpc': '2.0',
-                        'error': {
-                            'code': -32000,
-                            'message': f'Tool execution error: {str(e)}'
-                        },
-                        'id': request_id
-                    }
-                    response = HttpResponse(
-                        safe_json_dumps(response_data),
-                        content_type='application/json',
-                        status=500
-                    )
-                    response['Access-Control-Allow-Origin'] = '*'
-                    return response
-
-            # Unknown method
-            else:
-                response_data = {
-                    'jsonrpc': '2.0',
-                    'error': {
-                        'code': -32601,
-                        'message': f'Method not found: {method}'
-                    },
-                    'id': request_id
-                }
-                response = HttpResponse(
-                    json.dumps(response_data),
-                    content_type='application/json',
-                    status=404
-                )
-                response['Access-Control-Allow-Origin'] = '*'
-                return response
+        response_data, status_code = await _handle_message(data)
+        if response_data is None:
+            response = HttpResponse('', content_type='application/json', status=status_code)
+            response['Access-Control-Allow-Origin'] = '*'
+            return response
+        return _json_response(response_data, status=status_code)
 
     except Exception as e:
         import traceback
         traceback.print_exc()
-        response_data = {
-            'jsonrpc': '2.0',
-            'error': {
-                'code': -32000,
-                'message': f'Internal server error: {str(e)}'
-            },
-            'id': None
-        }
-        response = HttpResponse(
-            json.dumps(response_data),
-            content_type='application/json',
-            status=500
-        )
-        response['Access-Control-Allow-Origin'] = '*'
-        return response
+        return _json_response(_rpc_error(-32000, f'Internal server error: {str(e)}', None), status=500)